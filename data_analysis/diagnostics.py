@@ -1,11 +1,17 @@
+import io
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import scipy.stats as stats
-from scipy.stats import skew, kurtosis
 import numpy as np
 from typing import Dict, List, Optional, Union
 
+# Expected time difference between subsequent candles for each supported timeframe
+_TIMEFRAME_MAP = {
+    '1m': pd.Timedelta(minutes=1),
+    '1h': pd.Timedelta(hours=1),
+    '1d': pd.Timedelta(days=1)
+}
+
+
 def dataframe_diagnostics(
     df: pd.DataFrame,
     stage: str = "Initial",
@@ -13,8 +19,9 @@ def dataframe_diagnostics(
     print_diagnostics: bool = True,
     check_ohlc: bool = False,
     return_values: bool = True,
-    timeframe: str = '1m'  # New parameter for expected time difference
-) -> Optional[Dict[str, Union[int, List[str], Optional[str], List[Dict[str, Union[int, str, pd.Timedelta]]]]]]:
+    timeframe: str = '1m',  # New parameter for expected time difference
+    max_print_gaps: Optional[int] = 100
+) -> Optional[Dict[str, Union[int, List[str], Optional[str], pd.Timestamp, np.ndarray, List[Dict[str, Union[int, str, pd.Timedelta]]]]]]:
     """
     Perform diagnostics on a DataFrame to check for data issues, gaps, and NaN values. Multi-purpose function
     that can be used to print results output, check for OHLC integrity, return diagnostic results for further
@@ -28,138 +35,206 @@ def dataframe_diagnostics(
     - check_ohlc (bool): Whether to run an integrity check on OHLC values.
     - return_values (bool): Whether to return diagnostic results as a dictionary.
     - timeframe (str): The timeframe for the data (e.g., '1m', '1h', '1d').
+    - max_print_gaps (Optional[int]): Maximum number of individual gaps to print, None prints all of them.
 
     Returns:
-    - Optional[Dict[str, Union[int, List[str], Optional[str], List[Dict[str, Union[int, str, pd.Timedelta]]]]]]:
-      Dictionary with diagnostic metrics if `return_values` is True, otherwise None.
+    - Optional[Dict[str, Union[int, List[str], Optional[str], pd.Timestamp, np.ndarray, List[Dict[str, Union[int, str, pd.Timedelta]]]]]]:
+      Dictionary with diagnostic metrics if `return_values` is True, otherwise None. Alongside the formatted
+      'data_range' and gap strings, the raw 'start_time', 'end_time' and 'discontinuity_positions' are included.
     """
+    # Nothing is printed or returned, so there is no work to do
+    if not (print_diagnostics or print_gaps or check_ohlc or return_values):
+        return None
+
+    # The NaN, gap and duplicate metrics are only consumed by the printed report or the returned values,
+    # a call that only requests the OHLC check skips them entirely
+    report = print_diagnostics or return_values
     size = len(df)
-    total_nans = df.isna().values.sum()                          # Total NaN's overall
-    nan_cols = df.columns[df.isna().any()].tolist()              # Columns with any NaN values
-    rows_with_nans = df.isna().any(axis=1).sum()                 # Total rows with any NaN values
-
-    # Define the expected time difference based on the timeframe
-    if timeframe == '1m':
-        expected_diff = pd.Timedelta(minutes=1)
-    elif timeframe == '1h':
-        expected_diff = pd.Timedelta(hours=1)
-    elif timeframe == '1d':
-        expected_diff = pd.Timedelta(days=1)
-    else:
-        raise ValueError("Unsupported timeframe. Please use '1m', '1h', or '1d'.")
 
-    # Find all rows where the gaps between subsequent rows are greater than the expected difference
-    discontinuities = []
-    time_diffs = df['Open time'].diff().dropna()
-    discontinuities = time_diffs[time_diffs != expected_diff].index.tolist()
+    # Compute the NaN mask once and derive every NaN metric from the same boolean array,
+    # the counts are only needed when at least one NaN exists so a short-circuiting check gates them
+    has_any_nan = False
+    total_nans = 0
+    nan_cols = df.columns[:0]
+    rows_with_nans = 0
+    if report:
+        na_vals = df.isna().to_numpy()
+        has_any_nan = bool(na_vals.any())
+    if has_any_nan:
+        total_nans = int(na_vals.sum(dtype=np.int64))            # Total NaN's overall
+        col_any = na_vals.any(axis=0)
+        nan_cols = df.columns[col_any]                           # Columns with any NaN values
+        row_any = na_vals.any(axis=1)
+        rows_with_nans = int(row_any.sum(dtype=np.int64))        # Total rows with any NaN values
+
+    # Look up the expected time difference based on the timeframe
+    expected_diff = _TIMEFRAME_MAP.get(timeframe)
+    if expected_diff is None:
+        raise ValueError("Unsupported timeframe. Please use '1m', '1h', or '1d'.")
 
-    # Identify the start and end of each gap, the gap size, and indices of gaps
+    if not report:
+        _report_ohlc_integrity(df, check_ohlc, print_diagnostics)
+        return None
+
+    # Find all rows where the gaps between subsequent rows differ from the expected difference, the
+    # comparison runs directly on the datetime64 buffer and pairs involving NaT are not counted as gaps
+    open_time = df['Open time']
+    ot_values = open_time.values                                 # datetime64 view, to_numpy() would box tz-aware values
+    ot_first = open_time.iat[0]
+    ot_last = open_time.iat[-1]
+    diffs = np.diff(ot_values)
+    bad = (diffs != expected_diff.to_timedelta64()) & ~np.isnat(diffs)
+    disc_pos = np.flatnonzero(bad) + 1
+    num_discontinuities = len(disc_pos)
+
+    # Identify the start and end of each gap, the gap size, and indices of gaps, times are gathered for
+    # all gaps at once so no pandas indexer is invoked per gap
     gap_details = []
-    if print_gaps:
+    if (print_gaps and print_diagnostics) or return_values:
+        ot_array = open_time.array
+        start_times = ot_array[disc_pos - 1]
+        end_times = ot_array[disc_pos]
+        gap_sizes = end_times - start_times
         gap_details = [
             {
-                'Start Index': idx - 1,
-                'End Index': idx,
-                'Start Time': df['Open time'].iloc[idx - 1],
-                'End Time': df['Open time'].iloc[idx],
-                'Gap Size': df['Open time'].iloc[idx] - df['Open time'].iloc[idx - 1]
+                'Start Index': start_idx,
+                'End Index': end_idx,
+                'Start Time': start_time,
+                'End Time': end_time,
+                'Gap Size': gap_size
             }
-            for idx in discontinuities
+            for start_idx, end_idx, start_time, end_time, gap_size in zip(
+                df.index[disc_pos - 1].tolist(), df.index[disc_pos].tolist(), start_times, end_times, gap_sizes
+            )
         ]
 
-    # Filter the dataframe for duplicated rows and count the number of duplicates
-    duplicate_rows = df[df.duplicated(keep=False)]
-    num_duplicate_rows = len(duplicate_rows)
+    # Count rows sharing an 'Open time', the timestamp is the uniqueness key for OHLC candles. For sorted
+    # data without NaT duplicates are adjacent, so the time differences already computed above are reused
+    # and only unsorted data falls back to hashing the column
+    if len(diffs) and not np.isnat(ot_values).any() and not (diffs < np.timedelta64(0)).any():
+        repeated = diffs == np.timedelta64(0)
+        dup_mask = np.zeros(size, dtype=bool)
+        dup_mask[1:] |= repeated
+        dup_mask[:-1] |= repeated
+    else:
+        dup_mask = open_time.duplicated(keep=False).to_numpy()
+    num_duplicate_rows = int(dup_mask.sum(dtype=np.int64))
 
-    # Gaps locations can be returned for various processes: plotting, making selective calls to fill the gaps etc.
-    gap_start = f"{gap_details[0]['Start Index']}, {gap_details[0]['Start Time']}" if gap_details else None
-    gap_end = f"{gap_details[-1]['End Index']}, {gap_details[-1]['End Time']}" if gap_details else None
-    data_range = f"{df['Open time'].iloc[0]} - {df['Open time'].iloc[-1]}"
+    first_gap, last_gap = (gap_details[0], gap_details[-1]) if gap_details else (None, None)
 
     # All results will be printed to terminal in formatted output if print_diagnostics is True
     if print_diagnostics:
         print(f"\n--- {stage} Diagnostics ---")
         print(f"Timeframe: {timeframe}")
-        print(f"Start 'Open time': {df['Open time'].iloc[0]}, End 'Open time': {df['Open time'].iloc[-1]}")
+        print(f"Start 'Open time': {ot_first}, End 'Open time': {ot_last}")
         print(f"Size: {size} rows")
         print(f"Total NaNs: {total_nans}")
-        print(f"Columns with NaNs: {nan_cols if nan_cols else 'None'}")
+        print(f"Columns with NaNs: {nan_cols.tolist() if len(nan_cols) else 'None'}")
         print(f"Rows with NaNs: {rows_with_nans}")
-        if rows_with_nans > 0:
-            last_nan_row = df[df.isna().any(axis=1)].iloc[-1]
-            last_nan_index = df[df.isna().any(axis=1)].index[-1]
+        if has_any_nan:
+            # Scan back from the end of the cached row mask, argmax stops at the first True
+            last_nan_pos = len(row_any) - 1 - int(row_any[::-1].argmax())
+            last_nan_row = df.iloc[last_nan_pos]
+            last_nan_index = df.index[last_nan_pos]
             print(f"Final NaN row index: {last_nan_index}, 'Open time': {last_nan_row['Open time']}")
         print(f"Number of duplicate rows: {num_duplicate_rows}")
-        print(f"Number of discontinuities in 'Open time': {len(discontinuities)}")
-        if print_gaps:
-            first_gap_start = gap_details[0]['Start Time']
-            first_gap_index = gap_details[0]['Start Index']
-            last_gap_end = gap_details[-1]['End Time']
-            last_gap_index = gap_details[-1]['End Index']
-            print(f"Discontinuities range from index {first_gap_index} ('Open time': {first_gap_start}) to "
-                  f"index {last_gap_index} ('Open time': {last_gap_end}).")
+        print(f"Number of discontinuities in 'Open time': {num_discontinuities}")
+        if print_gaps and gap_details:
+            print(f"Discontinuities range from index {first_gap['Start Index']} ('Open time': {first_gap['Start Time']}) to "
+                  f"index {last_gap['End Index']} ('Open time': {last_gap['End Time']}).")
 
     # Selectively print information about the gaps, sometimes there are a lot so this output can be redacted
     if print_gaps and print_diagnostics:
-        print(f"\nDetected {len(gap_details)} data gaps:")
-        for i, gap in enumerate(gap_details):
-            print(f"Gap {i+1}: Start Index {gap['Start Index']}, End Index {gap['End Index']}, "
-                  f"Start Time {gap['Start Time']}, End Time {gap['End Time']}, Gap Size: {gap['Gap Size']}")
+        # Gap lines are buffered and written in one call rather than issuing a print per gap
+        buf = io.StringIO()
+        buf.write(f"\nDetected {len(gap_details)} data gaps:\n")
+        for i, gap in enumerate(gap_details[:max_print_gaps]):
+            buf.write(f"Gap {i+1}: Start Index {gap['Start Index']}, End Index {gap['End Index']}, "
+                      f"Start Time {gap['Start Time']}, End Time {gap['End Time']}, Gap Size: {gap['Gap Size']}\n")
+        if max_print_gaps is not None and len(gap_details) > max_print_gaps:
+            buf.write(f"... {len(gap_details) - max_print_gaps} more gaps not shown\n")
+        sys.stdout.write(buf.getvalue())
 
     if num_duplicate_rows > 0 and print_diagnostics:
+        duplicate_rows = df.iloc[dup_mask]
         print("\nDetected duplicate rows:")
         print(duplicate_rows)
 
     # Perform OHLC integrity check if required
-    ohlc_results = None
-    if check_ohlc:
-        ohlc_results = ohlc_integrity_check(df)
-        if print_diagnostics:
-            print("\n--- OHLC Integrity Check ---")
-            print(f"Invalid 'High' values: {ohlc_results['invalid_high_count']} rows")
-            print(f"Invalid 'Low' values: {ohlc_results['invalid_low_count']} rows")
-   
+    ohlc_results = _report_ohlc_integrity(df, check_ohlc, print_diagnostics)
+
+    # Gaps locations can be returned for various processes: plotting, making selective calls to fill the gaps etc.
+    # The formatted strings are only built here, raw values are returned alongside for consumers that need them
     if return_values:
+        gap_start = f"{first_gap['Start Index']}, {first_gap['Start Time']}" if gap_details else None
+        gap_end = f"{last_gap['End Index']}, {last_gap['End Time']}" if gap_details else None
+        data_range = f"{ot_first} - {ot_last}"
         return {
             'size': size,
             'total_nans': total_nans,
-            'nan_cols': nan_cols,
+            'nan_cols': nan_cols.tolist(),
             'rows_with_nans': rows_with_nans,
-            'num_discontinuities': len(discontinuities),
-            'first_discontinuity_index': discontinuities[0] if discontinuities else None,
-            'last_discontinuity_index': discontinuities[-1] if discontinuities else None,
+            'num_discontinuities': num_discontinuities,
+            'first_discontinuity_index': df.index[disc_pos[0]] if num_discontinuities else None,
+            'last_discontinuity_index': df.index[disc_pos[-1]] if num_discontinuities else None,
             'gap_start_time': gap_start,
             'gap_end_time': gap_end,
             'gaps': gap_details if gap_details else None,
             'data_range': data_range,
+            'start_time': ot_first,
+            'end_time': ot_last,
+            'discontinuity_positions': disc_pos,
             'duplicate_rows': num_duplicate_rows,
             'invalid_highs': ohlc_results['invalid_high_count'] if ohlc_results else None,
             'invalid_lows': ohlc_results['invalid_low_count'] if ohlc_results else None
         }
 
 
-def ohlc_integrity_check(df: pd.DataFrame) -> Dict[str, Union[int, pd.DataFrame]]:
+def _report_ohlc_integrity(df: pd.DataFrame, check_ohlc: bool, print_diagnostics: bool) -> Optional[Dict[str, int]]:
+    """Run the OHLC integrity check for dataframe_diagnostics if requested and print its summary."""
+    if not check_ohlc:
+        return None
+    ohlc_results = ohlc_integrity_check(df)
+    if print_diagnostics:
+        print("\n--- OHLC Integrity Check ---")
+        print(f"Invalid 'High' values: {ohlc_results['invalid_high_count']} rows")
+        print(f"Invalid 'Low' values: {ohlc_results['invalid_low_count']} rows")
+    return ohlc_results
+
+
+def ohlc_integrity_check(df: pd.DataFrame, return_rows: bool = False) -> Dict[str, Union[int, pd.DataFrame]]:
     """
     Verify the integrity of OHLC data, ensuring that 'High' >= 'Open', 'Close', 'Low' 
     and 'Low' <= 'Open', 'Close', 'High'.
 
     Parameters:
     - df (pd.DataFrame): The DataFrame containing OHLC data.
+    - return_rows (bool): Whether to also return the invalid rows as DataFrames.
 
     Returns:
-    - dict: Dictionary with counts and rows of invalid 'High' and 'Low' values.
+    - dict: Dictionary with counts (and optionally rows) of invalid 'High' and 'Low' values.
     """
-    invalid_high = df[df['High'] < df[['Open', 'Close', 'Low']].max(axis=1)]
-    
+    # Extract the OHLC columns as one contiguous float block and compare column views of it,
+    # fmax/fmin skip NaNs in the same way as the pandas row-wise max/min. A single scratch buffer
+    # is reused for both extrema so only the two boolean results are allocated
+    a = df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64, copy=False)
+    o, h, l, c = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+    scratch = np.empty(len(a), dtype=np.float64)
+    np.fmax(np.fmax(o, c, out=scratch), l, out=scratch)
+    bad_high = h < scratch
+
     # Check if Low <= Open, Close, High
-    invalid_low = df[df['Low'] > df[['Open', 'Close', 'High']].min(axis=1)]
-    
-    return {
-        'invalid_high_count': len(invalid_high),
-        'invalid_low_count': len(invalid_low),
-        'invalid_high_rows': invalid_high,
-        'invalid_low_rows': invalid_low
+    np.fmin(np.fmin(o, c, out=scratch), h, out=scratch)
+    bad_low = l > scratch
+
+    results = {
+        'invalid_high_count': int(bad_high.sum()),
+        'invalid_low_count': int(bad_low.sum())
     }
+    if return_rows:
+        results['invalid_high_rows'] = df.iloc[bad_high]
+        results['invalid_low_rows'] = df.iloc[bad_low]
+    return results
 
     
 def classify_nans(data: Union[pd.Series, pd.DataFrame]) -> Dict[str, Dict[str, Union[int, str]]]:
@@ -172,73 +247,93 @@ def classify_nans(data: Union[pd.Series, pd.DataFrame]) -> Dict[str, Dict[str, U
     Returns:
     - dict: Summary of NaN classifications by column.
     """
-    def classify_single_series(nan_series):
-        """Classify NaNs in a single series."""
-        nan_count = nan_series.sum()
-
-        if nan_series.all():
-            return nan_count, "Full-column NaNs"
-
-        non_nan_idx = nan_series[nan_series == False].index  # Indexes of non-NaN values
-        if len(non_nan_idx) == 0:
-            return nan_count, "Full-column NaNs"
-
-        leading_nans = non_nan_idx[0] > 0
-        trailing_nans = non_nan_idx[-1] < len(nan_series) - 1
-        interspersed_nans = nan_series[non_nan_idx[0]:non_nan_idx[-1]].any()
-
-        nan_types = []
-        if leading_nans:
-            nan_types.append("Leading NaNs")
-        if trailing_nans:
-            nan_types.append("Trailing NaNs")
-        if interspersed_nans:
-            nan_types.append("Interspersed NaNs")
-
-        return nan_count, ", ".join(nan_types) if nan_types else "No NaNs"
-
     if isinstance(data, pd.Series):
-        nan_count, classification = classify_single_series(data.isna())
-        return {data.name: {"nan_count": nan_count, "classification": classification}}
-
+        columns = [data.name]
+        nan_matrix = data.isna().to_numpy().reshape(-1, 1)
     elif isinstance(data, pd.DataFrame):
-        nan_summary = {}
-        for column in data.columns:
-            nan_count, classification = classify_single_series(data[column].isna())
-            nan_summary[column] = {"nan_count": nan_count, "classification": classification}
-        return nan_summary
-
+        columns = data.columns
+        nan_matrix = data.isna().to_numpy()
     else:
         raise ValueError("Input must be a pandas Series or DataFrame")
 
-
-def dataframe_statistics(df):
+    # Locate the first and last valid position of every column in one vectorized pass over the NaN matrix,
+    # any NaN that is neither leading nor trailing must lie between them
+    n = nan_matrix.shape[0]
+    valid_matrix = ~nan_matrix
+    has_valid = valid_matrix.any(axis=0)
+    nan_counts = nan_matrix.sum(axis=0, dtype=np.int64)
+    if n:
+        first_valid = valid_matrix.argmax(axis=0)
+        last_valid = (n - 1) - valid_matrix[::-1].argmax(axis=0)
+    else:
+        first_valid = last_valid = np.zeros(len(columns), dtype=np.int64)
+    leading = first_valid > 0
+    trailing = last_valid < n - 1
+    interspersed = (nan_counts - first_valid - (n - 1 - last_valid)) > 0
+
+    nan_summary = {}
+    for k, column in enumerate(columns):
+        if not has_valid[k]:
+            classification = "Full-column NaNs"
+        else:
+            nan_types = []
+            if leading[k]:
+                nan_types.append("Leading NaNs")
+            if trailing[k]:
+                nan_types.append("Trailing NaNs")
+            if interspersed[k]:
+                nan_types.append("Interspersed NaNs")
+            classification = ", ".join(nan_types) if nan_types else "No NaNs"
+        nan_summary[column] = {"nan_count": int(nan_counts[k]), "classification": classification}
+    return nan_summary
+
+
+def dataframe_statistics(
+    df: pd.DataFrame,
+    include_corr: bool = True,
+    include_describe: bool = True,
+    numeric_only: bool = True
+) -> Dict[str, Union[pd.DataFrame, pd.Series]]:
     """
     Calculate and print various statistics for each column in the dataframe, excluding the datetime column.
+
+    Parameters:
+    - df (pd.DataFrame): The DataFrame to summarize.
+    - include_corr (bool): Whether to compute the correlation matrix, the most expensive statistic.
+    - include_describe (bool): Whether to compute the summary statistics table.
+    - numeric_only (bool): Whether to restrict the statistics to numeric columns.
+
+    Returns:
+    - dict: The computed statistics keyed by name, so callers don't need to recompute them.
     """
-    # Temporarily drop the 'Open time' column
-    if 'Open time' and 'Close time' in df.columns:
-        df_numeric = df.drop(columns=['Open time', 'Close time'])
-    elif 'Open time' in df.columns:
-        df_numeric = df.drop(columns=['Open time'])
-    else:
-        df_numeric = df
+    # Select only the numeric columns, this excludes 'Open time', 'Close time' and any other non-numeric column
+    df_numeric = df.select_dtypes(include=[np.number]) if numeric_only else df
 
+    statistics = {}
     print("\n--- DataFrame Statistics ---")
-    print("Summary Statistics:")
-    print(df_numeric.describe())
+    if include_describe:
+        statistics['describe'] = df_numeric.describe()
+        print("Summary Statistics:")
+        print(statistics['describe'])
 
+    statistics['skew'] = df_numeric.skew()
     print("\nSkewness of Columns:")
-    print(df_numeric.skew())
+    print(statistics['skew'])
 
+    statistics['kurtosis'] = df_numeric.kurt()
     print("\nKurtosis of Columns:")
-    print(df_numeric.kurt())
+    print(statistics['kurtosis'])
 
+    statistics['missing'] = df_numeric.isna().sum()
     print("\nMissing Values per Column:")
-    print(df_numeric.isna().sum())
+    print(statistics['missing'])
 
-    print("\nCorrelation Matrix:")
-    print(df_numeric.corr())
+    if include_corr:
+        statistics['corr'] = df_numeric.corr()
+        print("\nCorrelation Matrix:")
+        print(statistics['corr'])
+
+    return statistics
 
 
 def visualize_distribution_with_stats(df, columns=None, bins=30, log_scale=False):
@@ -252,18 +347,25 @@ def visualize_distribution_with_stats(df, columns=None, bins=30, log_scale=False
     bins (int): Number of bins for histograms.
     log_scale (bool): Apply log scale to the plots.
     """
+    # Plotting libraries are imported here as this is the only function that needs them
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import scipy.stats as stats
+    from scipy.stats import describe
+
     if columns is None:
         columns = df.columns
     
     for col in columns:
         data = df[col].dropna()
 
-        # Summary Statistics
+        # Summary Statistics, computed together by describe (ddof=0 to match the population std)
+        summary = describe(data.to_numpy(), ddof=0)
         print(f"--- Summary Statistics for {col} ---")
-        print(f"Mean: {np.mean(data)}")
-        print(f"Standard Deviation: {np.std(data)}")
-        print(f"Skewness: {skew(data)}")
-        print(f"Kurtosis: {kurtosis(data)}")
+        print(f"Mean: {summary.mean}")
+        print(f"Standard Deviation: {np.sqrt(summary.variance)}")
+        print(f"Skewness: {summary.skewness}")
+        print(f"Kurtosis: {summary.kurtosis}")
         print("\n")
 
         # Creating the subplots
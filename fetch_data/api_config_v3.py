@@ -58,11 +58,13 @@ response structure and parameters to the existing configuration structure.
   reversed. Some exchanges return data in reverse chronological order, so this 
   flag ensures the data is ordered correctly from earliest to latest.
 
-- **construct_params**: A lambda function that constructs the parameters required 
-  for making API requests. The lambda takes the exchange configuration (`config`), 
-  a `start_datetime`, and an `end_datetime`, and returns a dictionary of request 
-  parameters. Each exchange has a unique lambda to handle its specific requirements 
-  for building the API request.
+- **construct_params**: A function that constructs the parameters required for 
+  making API requests. It takes the exchange configuration (`config`), a 
+  `start_datetime`, and an `end_datetime`, and returns a dictionary of request 
+  parameters. In each entry it is set to the exchange's `_make_<exchange>_params` 
+  factory, defined below, which is called once at import with the entry's 'limit' 
+  so the request window (timedelta or epoch span) is computed up front rather than 
+  on every call.
 
 ### Important Notes:
 - Always refer to the official API documentation of the exchange you're adding 
@@ -75,6 +77,110 @@ response structure and parameters to the existing configuration structure.
 
 from datetime import timedelta
 
+
+def _to_ms(dt):
+    # Epoch milliseconds for a datetime
+    return int(dt.timestamp() * 1000)
+
+
+def _make_binance_params(limit):
+    def construct_params(config, start_datetime, end_datetime):
+        return {
+            'symbol': config.symbol,
+            'interval': config.interval,
+            'startTime': str(_to_ms(start_datetime)),
+            'endTime': str(_to_ms(end_datetime)),
+            'limit': limit
+        }
+    return construct_params
+
+
+def _make_okx_params(limit):
+    # OKX windows are exclusive on both ends, 'before' is one minute early and 'after' spans limit - 1 minutes
+    before_ms = 60_000
+    after_ms = (int(limit) - 1) * 60_000
+
+    def construct_params(config, start_datetime, end_datetime):
+        start_ms = _to_ms(start_datetime)
+        return {
+            'instId': config.symbol,
+            'bar': config.interval,
+            'before': str(start_ms - before_ms),
+            'after': str(min(start_ms + after_ms, _to_ms(end_datetime))),
+            'limit': limit
+        }
+    return construct_params
+
+
+def _make_coinbase_params(limit):
+    limit_td = timedelta(minutes=int(limit))
+
+    def construct_params(config, start_datetime, end_datetime):
+        return {
+            'granularity': config.interval,
+            'start': start_datetime.isoformat(),
+            'end': min(start_datetime + limit_td, end_datetime).isoformat()
+        }
+    return construct_params
+
+
+def _make_bitfinex_params(limit):
+    limit_ms = int(limit) * 60_000
+
+    def construct_params(config, start_datetime, end_datetime):
+        start_ms = _to_ms(start_datetime)
+        return {
+            'start': start_ms,
+            'end': min(start_ms + limit_ms, _to_ms(end_datetime)),
+            'limit': limit
+        }
+    return construct_params
+
+
+def _make_kucoin_params(limit):
+    limit_s = int(limit) * 60
+
+    def construct_params(config, start_datetime, end_datetime):
+        start_s = start_datetime.timestamp()
+        return {
+            'type': config.interval,
+            'symbol': config.symbol,
+            'startAt': int(start_s),
+            'endAt': int(min(start_s + limit_s, end_datetime.timestamp()))
+        }
+    return construct_params
+
+
+def _make_bitmex_params(limit):
+    limit_td = timedelta(minutes=int(limit))
+
+    def construct_params(config, start_datetime, end_datetime):
+        return {
+            'symbol': config.symbol,
+            'binSize': config.interval,
+            'startTime': start_datetime.isoformat(),
+            'endTime': min(start_datetime + limit_td, end_datetime).isoformat(),
+            'count': limit,
+            'partial': False
+        }
+    return construct_params
+
+
+def _make_bitstamp_params(limit):
+    # Bitstamp includes the end candle, so the window stops one minute short of limit
+    limit_s = (int(limit) - 1) * 60
+
+    def construct_params(config, start_datetime, end_datetime):
+        start_s = start_datetime.timestamp()
+        return {
+            'start': int(start_s),
+            'end': int(min(start_s + limit_s, end_datetime.timestamp())),
+            'step': config.interval,
+            'limit': limit
+        }
+    return construct_params
+
+
 API_CONFIG = {
     'Binance': {
         'url': 'https://api.binance.com/api/v3/klines',
@@ -110,13 +216,7 @@ API_CONFIG = {
         'interval': {
             '1m': '1m'
         },
-        'construct_params': lambda config, start_datetime, end_datetime: {
-            'symbol': config.symbol,
-            'interval': config.interval,
-            'startTime': str(int(start_datetime.timestamp() * 1000)),
-            'endTime': str(int(end_datetime.timestamp() * 1000)),
-            'limit': '1000'
-        }
+        'construct_params': _make_binance_params
     },
     'OKX': {
         'url': 'https://www.okx.com/api/v5/market/history-candles',
@@ -152,13 +252,7 @@ API_CONFIG = {
         'interval': {
             '1m': '1m'
         },
-        'construct_params': lambda config, start_datetime, end_datetime: {
-            'instId': config.symbol,
-            'bar': config.interval,
-            'before': str(int((start_datetime - timedelta(minutes=1)).timestamp() * 1000)),
-            'after': str(int(min(start_datetime + timedelta(minutes=99), end_datetime).timestamp() * 1000)),
-            'limit': '100'
-        }
+        'construct_params': _make_okx_params
     },
     'Coinbase': {
         'url': 'https://api.exchange.coinbase.com/products/{product_id}/candles',
@@ -190,11 +284,7 @@ API_CONFIG = {
         'interval': {
             '1m': 60
         },
-        'construct_params': lambda config, start_datetime, end_datetime: {
-            'granularity': config.interval,
-            'start': start_datetime.isoformat(),
-            'end': (min(start_datetime + timedelta(minutes=int(config.limit)), end_datetime)).isoformat()
-        }
+        'construct_params': _make_coinbase_params
     },
     'Bitfinex': {
         'url': 'https://api-pub.bitfinex.com/v2/candles/trade:{timeframe}:{product_id}/hist',
@@ -226,11 +316,7 @@ API_CONFIG = {
         'interval': {
             '1m': '1m', '5m': '5m', '15m': '15m', '1h': '1h', '6h': '6h', '1d': '1D'
         },
-        'construct_params': lambda config, start_datetime, end_datetime: {
-            'start': int(start_datetime.timestamp() * 1000),
-            'end': int(min((start_datetime + timedelta(minutes=int(config.limit)), end_datetime)).timestamp() * 1000),
-            'limit': config.limit
-        }
+        'construct_params': _make_bitfinex_params
     },
     'KuCoin': {
         'url': 'https://api.kucoin.com/api/v1/market/candles',
@@ -266,12 +352,7 @@ API_CONFIG = {
         'interval': {
             '1m': '1min', '5m': '5min', '15m': '15min', '1h': '1hour', '1d': '1day'
         },
-        'construct_params': lambda config, start_datetime, end_datetime: {
-            'type': config.interval,
-            'symbol': config.symbol,
-            'startAt': int(start_datetime.timestamp()),
-            'endAt': int(min((start_datetime + timedelta(minutes=int(config.limit)), end_datetime)).timestamp())
-        }
+        'construct_params': _make_kucoin_params
     },
     'BitMEX': {
         'url': 'https://www.bitmex.com/api/v1/trade/bucketed',
@@ -307,14 +388,7 @@ API_CONFIG = {
         'interval': {
             '1m': '1m', '5m': '5m', '1h': '1h', '1d': '1d'
         },
-        'construct_params': lambda config, start_datetime, end_datetime: {
-            'symbol': config.symbol,
-            'binSize': config.interval,
-            'startTime': start_datetime.isoformat(),
-            'endTime': (min(start_datetime + timedelta(minutes=int(config.limit)), end_datetime)).isoformat(),
-            'count': config.limit,
-            'partial': False
-        }
+        'construct_params': _make_bitmex_params
     },
     'Bitstamp': {
         'url': 'https://www.bitstamp.net/api/v2/ohlc/{product_id}/',
@@ -352,12 +426,7 @@ API_CONFIG = {
             '6h': '21600',
             '1d': '86400'
         },
-        'construct_params': lambda config, start_datetime, end_datetime: {
-            'start': int((start_datetime ).timestamp()),
-            'end': int(min((start_datetime + timedelta(minutes=int(config.limit)) - timedelta(minutes=1)), end_datetime).timestamp()),
-            'step': config.interval,
-            'limit': config.limit
-        }
+        'construct_params': _make_bitstamp_params
     },
     # 'HitBTC': {
     #     'url': 'https://api.hitbtc.com/api/3/public/candles/{product_id}/',
@@ -446,4 +515,9 @@ API_CONFIG = {
     #         'date': start_datetime.strftime('%Y%m%d'),
     #     }
     # }
-}
\ No newline at end of file
+}
+
+
+# Build each exchange's request parameter function from its own 'limit', so the limit is only set in one place
+for _exchange_config in API_CONFIG.values():
+    _exchange_config['construct_params'] = _exchange_config['construct_params'](_exchange_config['limit'])
@@ -1,63 +1,167 @@
 import pandas as pd
+import numpy as np
 import concurrent.futures
-import dataframe_image as dfi
 import requests
 import json
 import os
-import copy
-import matplotlib.pyplot as plt
-
-from utils.file_utils import load_data, save_data
+import time
+import hashlib
+import inspect
+import threading
+from string import Formatter
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from typing import Optional, Tuple
+from utils.file_utils import load_data, save_data, create_path
 from data_analysis.diagnostics import dataframe_diagnostics
 from fetch_data.api_config_v3 import API_CONFIG
 from fetch_data.metadata_template import metadata_template, currency_name_map, exchange_schemas
+from fetch_data.resample_timeframe import AGGREGATION_RULES
+
+IMGUR_MAX_WORKERS = 5                # Maximum concurrent uploads, kept low to stay under Imgur's rate limit
+IMGUR_CACHE_FILE = 'data/cache/imgur_urls.json'
+IMGUR_CACHE_TTL = 30 * 24 * 60 * 60  # Time (in seconds) a cached Imgur link is reused before re-uploading the image
+DIAGNOSTICS_CACHE_FILE = 'data/cache/diagnostics.json'
+PLOT_MAX_POINTS = 2000               # Maximum points drawn in the close price plot
+UID_COLUMNS = ['Trading Pair', 'Exchange', 'Size']  # Columns that identify a logged diagnostics row
+
+# The template is serialized once so each pair gets a fresh copy from a fast json.loads instead of copy.deepcopy
+_METADATA_BYTES = json.dumps(metadata_template).encode()
+
+# The placeholder fields of the template are parsed once into (literal, field) pairs, so each pair only joins
+# the parts instead of str.format rescanning the long description every time
+_TEMPLATE_PARTS = {key: [(literal, field) for literal, field, _, _ in Formatter().parse(metadata_template[key])]
+                   for key in ('title', 'subtitle', 'id', 'description')}
+
+_imgur_cache = None
+_imgur_cache_lock = threading.Lock()
+_plot_figures = threading.local()
+
+
+def _generate_uid(df: pd.DataFrame) -> pd.Series:
+    """Build the 'Trading Pair_Exchange_Size' row identifier with vectorized string concatenation."""
+    return df['Trading Pair'].astype(str) + '_' + df['Exchange'].astype(str) + '_' + df['Size'].astype(str)
+
+
+def _log_parts(log_dir: str) -> list:
+    """List the Parquet part files of a log directory in the order they were written."""
+    if not os.path.isdir(log_dir):
+        return []
+    return sorted(entry.path for entry in os.scandir(log_dir) if entry.name.endswith('.parquet'))
 
 
 def save_data_with_check(df_new: pd.DataFrame, log_filename: str) -> None:
     """
-    Saves data to a log file, only new, unique rows are saved. This is to compare
+    Saves data to a log, only new, unique rows are saved. This is to compare
     diagnostics across each data update to spot any issues that may occur.
 
+    The log is an append-only directory of Parquet part files, each run with new
+    rows writes one new part so the cost of a save depends only on the new rows.
+
     Parameters:
     - df_new (pd.DataFrame): New data to be saved.
-    - log_filename (str): Name of the log file to save data in.
+    - log_filename (str): Name of the log to save data in.
 
     Returns:
     - None
     """
-    # Check for an existing log file and load, otherwise initialize a new dataframe for logs
-    try:
-        df_log = load_data(f'data/logs/{log_filename}.pkl')
-    except FileNotFoundError:
-        df_log = pd.DataFrame(columns=df_new.columns)
+    log_dir = create_path(f'data/logs/{log_filename}', log_info=False)
 
-    # If a log file exists, generate unique row identifiers to determine whether new data is being assessed,
-    # by comparing with existing row uids. If the unique id exists, no new diagnostic logs will be saved.
-    if not df_log.empty:
-        if 'uid' not in df_log.columns:
-            df_log['uid'] = df_log.apply(lambda row: f"{row['Trading Pair']}_{row['Exchange']}_{row['Size']}", axis=1)
+    # Only the uid columns of existing parts are read to determine whether new data is being assessed.
+    # If the unique id exists, no new diagnostic logs will be saved.
+    if _log_parts(log_dir):
+        df_log_keys = load_data(f'data/logs/{log_filename}', file_type='parquet', columns=UID_COLUMNS, log_info=False)
     else:
-        df_log['uid'] = []
+        # Migrate a legacy single file log (Parquet or pickle) into the first part of the log directory
+        df_log_keys = pd.DataFrame(columns=UID_COLUMNS)
+        for legacy_path, legacy_type in ((f'data/logs/{log_filename}.parquet', 'parquet'), (f'data/logs/{log_filename}.pkl', 'pickle')):
+            try:
+                df_legacy = load_data(legacy_path, file_type=legacy_type, log_info=False)
+            except FileNotFoundError:
+                continue
+            df_legacy = df_legacy.drop(columns=['uid'], errors='ignore')
+            save_data(df_legacy, f'data/logs/{log_filename}/part-0.parquet', file_type='parquet')
+            df_log_keys = df_legacy[UID_COLUMNS]
+            break
 
     # Generate unique identifiers for the new data to compare with existing uid's in previous logs
     if 'uid' not in df_new.columns:
-        df_new['uid'] = df_new.apply(lambda row: f"{row['Trading Pair']}_{row['Exchange']}_{row['Size']}", axis=1)
+        df_new['uid'] = _generate_uid(df_new)
 
     # Check for duplicates based on the unique identifier, if the uid for new data doesn't exist in the logs, save the row
-    df_to_save = df_new[~df_new['uid'].isin(df_log['uid'])]
+    # A plain set is built once from the logs so each new row is a single hash lookup without pandas dispatch
+    existing_uids = set(_generate_uid(df_log_keys).to_numpy().tolist())
+    is_new = np.fromiter((uid not in existing_uids for uid in df_new['uid'].to_numpy()), dtype=bool, count=len(df_new))
+    df_to_save = df_new[is_new]
 
-    # Append new records to logs if they are not duplicates
+    # Append new records to the log as a new part if they are not duplicates
     if not df_to_save.empty:
-        df_log = pd.concat([df_log, df_to_save], ignore_index=True)
-        df_log = df_log.drop(columns=['uid'])  # Remove 'uid' column before saving
-        save_data(df_log, f'data/logs/{log_filename}.pkl')
+        df_to_save = df_to_save.drop(columns=['uid']).reset_index(drop=True)  # Remove 'uid' column before saving
+        # Store categoricals as plain strings so every part file of the log shares the same schema
+        categorical_columns = df_to_save.select_dtypes(include='category').columns
+        df_to_save[categorical_columns] = df_to_save[categorical_columns].astype(str)
+        save_data(df_to_save, f'data/logs/{log_filename}/part-{time.time_ns()}.parquet', file_type='parquet')
     else:
         print("No new records to save. All records already exist.")
 
 
-def process_trading_pair(exchange: str, trading_pair: str, file_format: str, timeframe: str) -> dict:
+def _trading_pair_path(exchange: str, trading_pair: str, file_format: str, timeframe: str) -> str:
+    """Define the file path of a trading pair's OHLC data based on the file format and timeframe."""
+    if file_format == 'pkl':
+        return f'data/ohlc/{trading_pair}/{timeframe}/{trading_pair}_{timeframe}_{exchange}.pkl'
+    return f'data/ohlc_csv/{trading_pair}/{timeframe}/{trading_pair}_{timeframe}_{exchange}.csv'
+
+
+def _file_signature(file_path: str) -> Optional[str]:
+    """Identify a version of a file by its path, modification time and size, None if it doesn't exist."""
+    try:
+        stat = os.stat(create_path(file_path, log_info=False))
+    except FileNotFoundError:
+        return None
+    return f"{file_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _diagnostics_code_version() -> str:
+    """Hash the source of the diagnostics and of this module, which build the cached diagnostics results."""
+    digest = hashlib.sha256()
+    for module_path in (inspect.getfile(dataframe_diagnostics), __file__):
+        with open(module_path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _load_diagnostics_cache() -> dict:
     """
-    Processes OHLC data for a trading pair from a specific exchange, returning diagnostic metrics.
+    Load the file signature to diagnostics results cache from disk. The cache is discarded if it was
+    written by a different version of the diagnostics code, as its results may have a different format.
+
+    Returns:
+    - dict: The cached diagnostics results by file signature, empty if there are none for this code.
+    """
+    try:
+        with open(create_path(DIAGNOSTICS_CACHE_FILE, log_info=False)) as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != _diagnostics_code_version():
+        return {}
+    return cache.get('results', {})
+
+
+def _save_diagnostics_cache(cache: dict) -> None:
+    """Persist the diagnostics cache with its code version atomically so an interrupted write can't corrupt it."""
+    cache_path = create_path(DIAGNOSTICS_CACHE_FILE, create_missing_dirs=True, log_info=False)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w") as f:
+        # Diagnostics counts can be numpy scalars, store them as plain numbers
+        json.dump({'version': _diagnostics_code_version(), 'results': cache}, f, default=lambda value: value.item())
+    os.replace(tmp_path, cache_path)
+
+
+def load_trading_pair_data(exchange: str, trading_pair: str, file_format: str, timeframe: str) -> pd.DataFrame:
+    """
+    Loads the OHLC data for a trading pair from a specific exchange and converts its time columns to datetimes.
 
     Parameters:
     - exchange (str): Name of the exchange.
@@ -66,48 +170,109 @@ def process_trading_pair(exchange: str, trading_pair: str, file_format: str, tim
     - timeframe (str): Timeframe of the data ('1m', '1h', '1d').
 
     Returns:
-    - dict: Dictionary of diagnostics information for the processed trading pair.
+    - pd.DataFrame: The loaded OHLC data.
     """
-    try:
-        # Define the file path based on the timeframe
-        if file_format == 'pkl':
-            df = load_data(f'data/ohlc/{trading_pair}/{timeframe}/{trading_pair}_{timeframe}_{exchange}.pkl')
-        elif file_format == 'csv':
-            df = load_data(f'data/ohlc_csv/{trading_pair}/{timeframe}/{trading_pair}_{timeframe}_{exchange}.csv', file_type='csv')
-
-        df['Open time'] = pd.to_datetime(df['Open time'])
-
-        # Perform diagnostics with the specified timeframe
-        diagnostics = dataframe_diagnostics(df, print_diagnostics=False, print_gaps=True, return_values=True, check_ohlc=True, timeframe=timeframe)
-
-        # Return the result in dictionary form
-        return {
-            'File Format': file_format,
-            'Timeframe': timeframe,
-            'Trading Pair': trading_pair,
-            'Exchange': exchange,
-            'Data Range': f"{diagnostics['data_range'].split(' - ')[0].split()[0]} - {diagnostics['data_range'].split(' - ')[1].split()[0]}",
-            'Size': diagnostics['size'],
-            'Total NaNs': diagnostics['total_nans'],
-            'Rows with NaNs': diagnostics['rows_with_nans'],
-            'Discontinuities': diagnostics['num_discontinuities'],
-            'Discontinuity Start': diagnostics['gap_start_time'],
-            'Discontinuity End': diagnostics['gap_end_time'],
-            'Duplicate Rows': diagnostics['duplicate_rows'],
-            'Invalid Highs': diagnostics['invalid_highs'],
-            'Invalid Lows': diagnostics['invalid_lows'],
-        }
-    except Exception as e:
-        print(f"Error processing {trading_pair} on {exchange} with {file_format} and {timeframe}: {e}")
-        return None
+    file_path = _trading_pair_path(exchange, trading_pair, file_format, timeframe)
+    if file_format == 'pkl':
+        df = load_data(file_path)
+    elif file_format == 'csv':
+        df = load_data(file_path, file_type='csv')
+
+    # Pickles already store datetimes, CSVs store ISO strings and raw exchange data stores epoch
+    # numbers, give pandas the exact format so it never falls back to slow per-element inference
+    exchange_config = API_CONFIG.get(exchange, {})
+    for time_column in exchange_config.get('time_columns', ['Open time']):
+        times = df[time_column]
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            if pd.api.types.is_numeric_dtype(times):
+                df[time_column] = pd.to_datetime(times, unit=exchange_config.get('time_unit', 'ms'), cache=True)
+            else:
+                df[time_column] = pd.to_datetime(times, format='ISO8601', cache=True)
+    return df
+
+
+def process_trading_pair(exchange: str, trading_pair: str, timeframe: str) -> Tuple[Optional[dict], Optional[dict]]:
+    """
+    Processes OHLC data for a trading pair from a specific exchange, returning diagnostic metrics for both
+    the pkl and csv copies of the data. When the csv holds exactly the same data as the pkl, the pkl
+    diagnostics are reused rather than recomputed.
 
+    Parameters:
+    - exchange (str): Name of the exchange.
+    - trading_pair (str): Trading pair identifier.
+    - timeframe (str): Timeframe of the data ('1m', '1h', '1d').
 
-def upload_image_to_imgur(image_path: str, client_id: str) -> str:
+    Returns:
+    - Tuple[Optional[dict], Optional[dict]]: Dictionaries of diagnostics information for the pkl and csv
+      data, None for a format that could not be processed.
+    """
+    results = {}
+    df_pkl, diagnostics_pkl = None, None
+    for file_format in ('pkl', 'csv'):
+        try:
+            df = load_trading_pair_data(exchange, trading_pair, file_format, timeframe)
+
+            # Perform diagnostics with the specified timeframe
+            if diagnostics_pkl is not None and df.equals(df_pkl):
+                diagnostics = diagnostics_pkl
+            else:
+                diagnostics = dataframe_diagnostics(df, print_diagnostics=False, print_gaps=True, return_values=True, check_ohlc=True, timeframe=timeframe)
+            if file_format == 'pkl':
+                df_pkl, diagnostics_pkl = df, diagnostics
+
+            # Return the result in dictionary form
+            results[file_format] = {
+                'File Format': file_format,
+                'Timeframe': timeframe,
+                'Trading Pair': trading_pair,
+                'Exchange': exchange,
+                'Data Range': f"{diagnostics['data_range'].split(' - ')[0].split()[0]} - {diagnostics['data_range'].split(' - ')[1].split()[0]}",
+                'Size': diagnostics['size'],
+                'Total NaNs': diagnostics['total_nans'],
+                'Rows with NaNs': diagnostics['rows_with_nans'],
+                'Discontinuities': diagnostics['num_discontinuities'],
+                'Discontinuity Start': diagnostics['gap_start_time'],
+                'Discontinuity End': diagnostics['gap_end_time'],
+                'Duplicate Rows': diagnostics['duplicate_rows'],
+                'Invalid Highs': diagnostics['invalid_highs'],
+                'Invalid Lows': diagnostics['invalid_lows'],
+            }
+        except Exception as e:
+            print(f"Error processing {trading_pair} on {exchange} with {file_format} and {timeframe}: {e}")
+            results[file_format] = None
+    return results['pkl'], results['csv']
+
+
+def _load_imgur_cache() -> dict:
+    """Load the image hash to Imgur link cache from disk on first use."""
+    global _imgur_cache
+    if _imgur_cache is None:
+        try:
+            with open(create_path(IMGUR_CACHE_FILE, log_info=False)) as f:
+                _imgur_cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _imgur_cache = {}
+    return _imgur_cache
+
+
+def _save_imgur_cache(cache: dict) -> None:
+    """Persist the Imgur link cache atomically so an interrupted write can't corrupt it."""
+    cache_path = create_path(IMGUR_CACHE_FILE, create_missing_dirs=True, log_info=False)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def upload_image_to_imgur(image_path: str, client_id: str, session: requests.Session = None) -> str:
     """
-    Uploads an image to Imgur and returns the link.
+    Uploads an image to Imgur and returns the link. Links are cached by a hash of the image
+    content, so an image identical to one uploaded within IMGUR_CACHE_TTL is not uploaded again.
 
     Parameters:
     - image_path (str): Path to the image file.
+    - client_id (str): Imgur API client ID.
+    - session (requests.Session, optional): Shared session to reuse pooled connections across uploads.
 
     Returns:
     - str: Link to the uploaded image on Imgur.
@@ -115,8 +280,55 @@ def upload_image_to_imgur(image_path: str, client_id: str) -> str:
     url = "https://api.imgur.com/3/image"
     headers = {'Authorization': f'Client-ID {client_id}'}
     with open(image_path, 'rb') as image_file:
-        response = requests.post(url, headers=headers, files={'image': image_file})
-    return response.json()['data']['link']
+        image_bytes = image_file.read()
+    image_hash = hashlib.blake2b(image_bytes).hexdigest()
+
+    with _imgur_cache_lock:
+        cached = _load_imgur_cache().get(image_hash)
+    if cached and time.time() - cached['uploaded'] < IMGUR_CACHE_TTL:
+        return cached['link']
+
+    post = session.post if session else requests.post
+    response = post(url, headers=headers, files={'image': (os.path.basename(image_path), image_bytes)})
+    link = response.json()['data']['link']
+
+    with _imgur_cache_lock:
+        cache = _load_imgur_cache()
+        cache[image_hash] = {'link': link, 'uploaded': time.time()}
+        _save_imgur_cache(cache)
+    return link
+
+
+def upload_images_to_imgur(image_paths: list, client_id: str) -> dict:
+    """
+    Uploads a batch of images to Imgur concurrently, so the total upload time is bound by the
+    slowest upload rather than the sum of all of them.
+
+    Parameters:
+    - image_paths (list): Paths to the image files.
+    - client_id (str): Imgur API client ID.
+
+    Returns:
+    - dict: Mapping of each image path to its link on Imgur.
+    """
+    with requests.Session() as session, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=IMGUR_MAX_WORKERS) as executor:
+        links = executor.map(lambda path: upload_image_to_imgur(path, client_id, session), image_paths)
+        return dict(zip(image_paths, links))
+
+
+def _fill_template(parts: list, context: dict) -> str:
+    """
+    Fills a template parsed into (literal, field) pairs with the values of its placeholder fields.
+
+    Parameters:
+    - parts (list): The (literal, field) pairs of the template, field is None after the last placeholder.
+    - context (dict): Values of the placeholder fields.
+
+    Returns:
+    - str: The filled in template.
+    """
+    return ''.join(literal if field is None else literal + str(context[field]) for literal, field in parts)
 
 
 def generate_metadata(trading_pair: str, imgur_url_1: str, imgur_url_2: str, output_dir: str, asset_exchange_map: dict, timeframe: str) -> None:
@@ -138,27 +350,32 @@ def generate_metadata(trading_pair: str, imgur_url_1: str, imgur_url_2: str, out
     # Dynamically get the full currency name from the mapping i.e. BTCUSD evaluates to Bitcoin
     currency_name = currency_name_map.get(trading_pair, trading_pair)
 
-    # Make a deep copy of the metadata template to reset for each trading pair and not include previous appends
-    metadata = copy.deepcopy(metadata_template)
-    metadata["title"] = metadata["title"].format(currency_name=currency_name, currency_abbr=trading_pair, timeframe=timeframe)
-    metadata["subtitle"] = metadata["subtitle"].format(currency_abbr=trading_pair, timeframe=timeframe)
-    metadata["id"] = metadata["id"].format(currency_abbr=trading_pair, timeframe=timeframe)
-    metadata["description"] = metadata["description"].format(currency_abbr=trading_pair, timeframe=timeframe, imgur_url_1=imgur_url_1, imgur_url_2=imgur_url_2)
+    # Make a fresh copy of the metadata template to reset for each trading pair and not include previous appends
+    metadata = json.loads(_METADATA_BYTES)
+    context = {'currency_name': currency_name, 'currency_abbr': trading_pair, 'timeframe': timeframe,
+               'imgur_url_1': imgur_url_1, 'imgur_url_2': imgur_url_2}
+    for key, parts in _TEMPLATE_PARTS.items():
+        metadata[key] = _fill_template(parts, context)
 
-    # Add the relevant resources based on the exchanges that provide data for this trading pair and timeframe
+    # Add the relevant resources based on the exchanges that provide data for this trading pair and timeframe.
+    # Resampled data only keeps the columns with an aggregation rule
     for exchange in asset_exchange_map[trading_pair]:
+        fields = exchange_schemas.get(exchange, [])
+        if timeframe != '1m' and exchange in AGGREGATION_RULES:
+            fields = [field for field in fields if field["name"] in AGGREGATION_RULES[exchange]]
         metadata["resources"].append({
             "path": f"{trading_pair}_{timeframe}_{exchange}.csv",
             "description": f"{timeframe} historical data for {trading_pair} from {exchange}",
             "schema": {
-                "fields": exchange_schemas.get(exchange, [])
+                "fields": fields
             }
         })
 
     # Write to file, dynamically setting the output directory, different currencies are separated by directory
     output_file = os.path.join(output_dir, "dataset-metadata.json")
+    # Serialize in one call and write once, json.dump would issue a separate write for every encoded chunk
     with open(output_file, "w") as f:
-        json.dump(metadata, f, indent=2)
+        f.write(json.dumps(metadata, indent=2))
 
     print(f"Metadata for {currency_name} ({trading_pair}) at {timeframe} saved to {output_file}")
 
@@ -181,12 +398,26 @@ def create_dataframe_image(df_sorted: pd.DataFrame, trading_pair: str, image_pat
     df_subset = df_sorted[df_sorted['Trading Pair'] == trading_pair]
 
     if not df_subset.empty:
-        def color_rows(row):
-            background = 'black' if row.name % 2 == 0 else '#333333'
-            return [f'background-color: {background}; color: white'] * len(row)
-
-        df_styled = df_subset.style.apply(color_rows, axis=1)
-        dfi.export(df_styled, image_path)
+        # Draw the table directly with matplotlib rather than rendering styled HTML in a headless browser,
+        # a standalone Figure is used instead of pyplot's global state so pairs can be drawn from threads
+        fig = Figure(figsize=(len(df_subset.columns), (len(df_subset) + 1) * 0.3))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        ax.axis('off')
+        # Stripe the data rows, the full colour matrix is built in one vectorized expression
+        row_colours = np.where(np.arange(len(df_subset)) % 2 == 0, 'black', '#333333')
+        cell_colours = np.repeat(row_colours[:, None], len(df_subset.columns), axis=1)
+        tbl = ax.table(cellText=df_subset.values, cellColours=cell_colours, colLabels=df_subset.columns, loc='center')
+        tbl.auto_set_font_size(False)
+        tbl.set_fontsize(9)
+        tbl.auto_set_column_width(col=list(range(len(df_subset.columns))))
+
+        # Row 0 is the header, every other cell has a dark background and needs white text
+        for (row, col), cell in tbl.get_celld().items():
+            if row > 0:
+                cell.get_text().set_color('white')
+
+        fig.savefig(image_path, bbox_inches='tight', dpi=150)
         print(f"Image saved for {trading_pair}: {image_path}")
         return image_path
     else:
@@ -194,6 +425,20 @@ def create_dataframe_image(df_sorted: pd.DataFrame, trading_pair: str, image_pat
         return None
     
 
+def _get_plot_figure() -> tuple:
+    """
+    Return this thread's reusable close price figure and axes with the previous plot cleared. The figure
+    is drawn straight onto an Agg canvas, and each thread keeps its own so pairs can be drawn concurrently.
+    """
+    if not hasattr(_plot_figures, 'fig'):
+        _plot_figures.fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(_plot_figures.fig)
+        _plot_figures.ax = _plot_figures.fig.subplots()
+    else:
+        _plot_figures.ax.clear()
+    return _plot_figures.fig, _plot_figures.ax
+
+
 def create_plot_image(df: pd.DataFrame, trading_pair: str, plot_image_path: str) -> None:
     """
     Creates and saves a line plot of the closing prices to be uploaded to the
@@ -207,18 +452,55 @@ def create_plot_image(df: pd.DataFrame, trading_pair: str, plot_image_path: str)
     Returns:
     - None
     """
-    plt.figure(figsize=(10, 6))
-    plt.plot(df['Open time'], df['Close'], color='blue', label='Close Price')
-    plt.title(f'{trading_pair} Close Prices Over Time')
-    plt.xlabel('Open Time')
-    plt.ylabel('Close Price')
-    plt.legend()
-
-    plt.savefig(plot_image_path)
-    plt.close()
+    # The figure is only ~1000 pixels wide, so plot a strided sample instead of every candle. The stride is
+    # rounded up so at most PLOT_MAX_POINTS points are drawn
+    stride = max(1, -(-len(df) // PLOT_MAX_POINTS))
+    df_plot = df.iloc[::stride]
+
+    fig, ax = _get_plot_figure()
+    ax.plot(df_plot['Open time'], df_plot['Close'], color='blue', label='Close Price')
+    ax.set_title(f'{trading_pair} Close Prices Over Time')
+    ax.set_xlabel('Open Time')
+    ax.set_ylabel('Close Price')
+    ax.legend()
+
+    fig.savefig(plot_image_path)
     print(f"Plot saved for {trading_pair} at {plot_image_path}")
 
 
+def create_pair_images(df_sorted: pd.DataFrame, trading_pair: str, timeframe: str) -> Tuple[str, str]:
+    """
+    Creates the diagnostics table image and close price plot for a trading pair. The plot is only
+    redrawn when the Combined_Index data is newer than the existing plot image.
+
+    Parameters:
+    - df_sorted (pd.DataFrame): Sorted diagnostics of all currencies and exchanges.
+    - trading_pair (str): Trading pair identifier.
+    - timeframe (str): Timeframe of the data ('1m', '1h', '1d').
+
+    Returns:
+    - Tuple[str, str]: File paths of the table image and the plot image.
+    """
+    dataframe_image_path = f"/home/hooch/trading/data/images/{trading_pair}_{timeframe}_dataframe.png"
+    plot_image_path = f"/home/hooch/trading/data/images/{trading_pair}_{timeframe}_plot.png"
+
+    df_subset = df_sorted[df_sorted['Trading Pair'] == trading_pair]
+    df_subset = df_subset.reset_index(drop=True)
+    create_dataframe_image(df_subset, trading_pair, dataframe_image_path)
+
+    # Only load the index data and redraw the plot if the source has changed since the plot was saved,
+    # an unchanged plot also hits the Imgur cache as its bytes are the same
+    source_path = f'data/ohlc/{trading_pair}/{timeframe}/{trading_pair}_{timeframe}_Combined_Index.pkl'
+    source_mtime = os.path.getmtime(create_path(source_path, log_info=False))
+    plot_mtime = os.path.getmtime(plot_image_path) if os.path.exists(plot_image_path) else 0
+    if plot_mtime < source_mtime:
+        df = load_data(source_path)
+        create_plot_image(df, trading_pair, plot_image_path)
+    else:
+        print(f"Plot for {trading_pair} is up to date, reusing {plot_image_path}")
+    return dataframe_image_path, plot_image_path
+
+
 def main() -> None:
     """
     Main function to process trading pairs from various exchanges, generate diagnostics, and save metadata.
@@ -228,74 +510,88 @@ def main() -> None:
     """
     client_id = 'enter_imgur_API_key'
     timeframes = ['1m', '1h', '1d']
-    exchanges = list(API_CONFIG.keys())
-    exchanges.append('Combined_Index')
+
+    # Pairs supported by each exchange, computed once as API_CONFIG doesn't change during a run.
+    # Binance supports all pairs so its pairs are used for the Combined_Index
+    exchange_pairs = {exchange: tuple(config['pairs']) for exchange, config in API_CONFIG.items()}
+    exchange_pairs['Combined_Index'] = exchange_pairs['Binance']
+
+    # Generate a dictionary of which exchange provides data for which currencies
+    asset_exchange_map = {}
+    for exchange in API_CONFIG:
+        for trading_pair in exchange_pairs[exchange]:
+            asset_exchange_map.setdefault(trading_pair, []).append(exchange)
+
+    # Diagnostics are cached by source file signature, so unchanged files are not reloaded or diagnosed.
+    # Only the signatures seen in this run are kept, dropping entries for files that have since changed.
+    diagnostics_cache = _load_diagnostics_cache()
+    current_cache = {}
 
     for timeframe in timeframes:
         results_pkl = []
         results_csv = []
 
-        # Use ThreadPoolExecutor for concurrency
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = []
-
-            # Submit tasks for each exchange and trading pair for both pkl and csv source files
-            for exchange in exchanges:
-                if exchange == 'Combined_Index':
-                    pair_keys = list(API_CONFIG['Binance']['pairs'].keys())
-                else:
-                    pair_keys = list(API_CONFIG[exchange]['pairs'].keys())
+        # Use ProcessPoolExecutor as loading and diagnosing the data is CPU-bound and would serialize on the GIL
+        with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {}
 
+            # Submit tasks for each exchange and trading pair for both pkl and csv source files,
+            # unless the diagnostics of both files are already cached
+            for exchange, pair_keys in exchange_pairs.items():
                 for trading_pair in pair_keys:
-                    futures.append(executor.submit(process_trading_pair, exchange, trading_pair, 'pkl', timeframe))
-                    futures.append(executor.submit(process_trading_pair, exchange, trading_pair, 'csv', timeframe))
+                    signatures = tuple(_file_signature(_trading_pair_path(exchange, trading_pair, file_format, timeframe))
+                                       for file_format in ('pkl', 'csv'))
+                    if all(signature in diagnostics_cache for signature in signatures):
+                        results_pkl.append(diagnostics_cache[signatures[0]])
+                        results_csv.append(diagnostics_cache[signatures[1]])
+                        current_cache.update((signature, diagnostics_cache[signature]) for signature in signatures)
+                    else:
+                        futures[executor.submit(process_trading_pair, exchange, trading_pair, timeframe)] = signatures
 
             # Collect results as they are completed
             for future in concurrent.futures.as_completed(futures):
-                result = future.result()
-                if result:
-                    if result['File Format'] == 'pkl':
-                        results_pkl.append(result)
-                    elif result['File Format'] == 'csv':
-                        results_csv.append(result)
+                result_pkl, result_csv = future.result()
+                for signature, result in zip(futures[future], (result_pkl, result_csv)):
+                    if result and signature:
+                        current_cache[signature] = result
+                if result_pkl:
+                    results_pkl.append(result_pkl)
+                if result_csv:
+                    results_csv.append(result_csv)
+
+        _save_diagnostics_cache(current_cache)
 
         # Create DataFrames from the results
         df_pkl = pd.DataFrame(results_pkl)
         df_csv = pd.DataFrame(results_csv)
 
+        # Exchange and pair names repeat across many rows, as categoricals (with lexically ordered categories)
+        # the sort compares small integer codes and the per-pair filters compare codes rather than strings
+        category_dtypes = {'Exchange': 'category', 'Trading Pair': 'category'}
+        df_pkl = df_pkl.astype(category_dtypes)
+        df_csv = df_csv.astype(category_dtypes)
+
         # Sort by 'Exchange' and 'Trading Pair', then drop 'File Format' and reset index for presenting the summary tables
         df_pkl_sorted = df_pkl.sort_values(by=['Exchange', 'Trading Pair']).drop(columns=['File Format']).reset_index(drop=True)
         df_csv_sorted = df_csv.sort_values(by=['Exchange', 'Trading Pair']).drop(columns=['File Format']).reset_index(drop=True)
 
-        # Generate a dictionary of which exchange provides data for which currencies
-        asset_exchange_map = {}
-        for exchange in API_CONFIG:
-            pair_keys = list(API_CONFIG[exchange]['pairs'].keys())
-            for trading_pair in pair_keys:
-                if trading_pair not in asset_exchange_map:
-                    asset_exchange_map[trading_pair] = []
-                asset_exchange_map[trading_pair].append(exchange)
-
         # Generate images for each trading pair by creating subsets from the aggregated dataframe
         # Binance is used to generate the pair_keys (i.e., BTCUSD) because it supports all pairs.
         # Metadata for each currency pair is generated here, including images, links, and diagnostic summaries
-        pair_keys = list(API_CONFIG['Binance']['pairs'].keys())
-        for trading_pair in pair_keys:
-            metadata_dir = f"/home/hooch/trading/data/ohlc_csv/{trading_pair}/{timeframe}"
-            dataframe_image_path = f"/home/hooch/trading/data/images/{trading_pair}_{timeframe}_dataframe.png"
-            plot_image_path = f"/home/hooch/trading/data/images/{trading_pair}_{timeframe}_plot.png"
-
-            df_subset = df_pkl_sorted[df_pkl_sorted['Trading Pair'] == trading_pair]
-            df_subset = df_subset.reset_index(drop=True)
-            df = load_data(f'data/ohlc/{trading_pair}/{timeframe}/{trading_pair}_{timeframe}_Combined_Index.pkl')
-
-            create_dataframe_image(df_subset, trading_pair, dataframe_image_path)
-            create_plot_image(df, trading_pair, plot_image_path)
-
-            dataframe_image_url = upload_image_to_imgur(dataframe_image_path, client_id)
-            close_plot_url = upload_image_to_imgur(plot_image_path, client_id)
-
-            generate_metadata(trading_pair, dataframe_image_url, close_plot_url, metadata_dir, asset_exchange_map, timeframe)
+        pair_keys = exchange_pairs['Binance']
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(pair_keys)) as executor:
+            # Pairs are independent, draw their images concurrently as loading and saving the files releases the GIL
+            image_paths = dict(zip(pair_keys, executor.map(lambda pair: create_pair_images(df_pkl_sorted, pair, timeframe), pair_keys)))
+
+            # Upload the images for all pairs at once and then write each pair's metadata with its links
+            image_urls = upload_images_to_imgur([path for paths in image_paths.values() for path in paths], client_id)
+            metadata_futures = [
+                executor.submit(generate_metadata, trading_pair, image_urls[dataframe_image_path], image_urls[plot_image_path],
+                                f"/home/hooch/trading/data/ohlc_csv/{trading_pair}/{timeframe}", asset_exchange_map, timeframe)
+                for trading_pair, (dataframe_image_path, plot_image_path) in image_paths.items()
+            ]
+            for future in concurrent.futures.as_completed(metadata_futures):
+                future.result()
 
         save_data_with_check(df_pkl_sorted, f'{timeframe}_pkl_log')
         save_data_with_check(df_csv_sorted, f'{timeframe}_csv_log')
@@ -1,28 +1,85 @@
 import pandas as pd
-from typing import Optional, List
+import numpy as np
+import concurrent.futures
+import os
+import json
+from functools import reduce
+from typing import Optional, List, Tuple
 from datetime import datetime
-from utils.file_utils import load_data, save_data
+from utils.file_utils import load_data, save_data, create_path
 from fetch_data.api_config_v3 import API_CONFIG
 
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+MINUTE = np.timedelta64(1, 'm')
 
-def get_last_timestamp(filepath: str) -> Optional[datetime]:
+
+def _file_signature(file_path: str) -> Optional[str]:
+    """Identify a version of a file by its modification time and size, None if it doesn't exist."""
+    try:
+        stat = os.stat(create_path(file_path, log_info=False))
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _last_timestamp_path(filepath: str) -> str:
+    """Path of the sidecar file recording the last timestamp of a combined file."""
+    return f"{os.path.splitext(filepath)[0]}_last_timestamp.json"
+
+
+def save_last_timestamp(filepath: str, last_timestamp: datetime) -> None:
+    """
+    Records the last timestamp of a combined file in a small sidecar file, alongside the signature of
+    the combined file it was taken from. The sidecar is written atomically so an interrupted write
+    can't corrupt it.
+
+    Parameters:
+    - filepath (str): Path to the combined file.
+    - last_timestamp (datetime): The maximum 'Open time' of the combined file.
+
+    Returns:
+    - None
+    """
+    sidecar_path = create_path(_last_timestamp_path(filepath), create_missing_dirs=True, log_info=False)
+    tmp_path = f"{sidecar_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({'signature': _file_signature(filepath), 'last_timestamp': pd.Timestamp(last_timestamp).isoformat()}, f)
+    os.replace(tmp_path, sidecar_path)
+
+
+def load_combined_data(filepath: str) -> Tuple[Optional[pd.DataFrame], Optional[datetime]]:
     """
-    If a current combined file exists, the last timestamp is retrieved and 
-    used as a marker to perform further combining on only new data, if there 
-    is no current file None is returned as a flag to create a new combined file.
+    If a current combined file exists, the last timestamp is retrieved and used as a marker
+    to perform further combining on only new data. The timestamp is read from the sidecar
+    file written with the combined file, so the history doesn't have to be loaded just to
+    find its end. If the sidecar is missing or was written for another version of the file,
+    the file is loaded once instead and returned, so the new data can be appended to it
+    without reading the file a second time. If there is no current file None is returned
+    as a flag to create a new combined file.
 
     Parameters:
     - filepath (str): Path to the file containing OHLC data.
 
     Returns:
-    - datetime or None: The maximum timestamp from the 'Open time' column if
-      the file exists; otherwise, None if the file is not found.
+    - Tuple[pd.DataFrame or None, datetime or None]: The existing combined data if it had
+      to be loaded, otherwise None, and the maximum timestamp from its 'Open time' column
+      if the file exists; otherwise, None for both if the file is not found.
     """
+    signature = _file_signature(filepath)
+    if signature is None:
+        return None, None
+
     try:
-        df = load_data(filepath)
-        return df['Open time'].max()
-    except FileNotFoundError:
-        return None
+        with open(create_path(_last_timestamp_path(filepath), log_info=False)) as f:
+            sidecar = json.load(f)
+        if sidecar['signature'] == signature:
+            return None, pd.Timestamp(sidecar['last_timestamp'])
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+
+    df = load_data(filepath)
+    return df, df['Open time'].max()
 
 
 def load_new_data(filepath: str, last_timestamp: Optional[datetime]) -> pd.DataFrame:
@@ -45,14 +102,97 @@ def load_new_data(filepath: str, last_timestamp: Optional[datetime]) -> pd.DataF
     return df
 
 
+def round_prices(values: np.ndarray) -> np.ndarray:
+    """
+    Rounds prices to 2 d.p. in place, without the temporary frames of DataFrame.round. The values are
+    scaled, rounded to the nearest integer and scaled back, the same steps as np.round(values, 2), so
+    the results are identical.
+
+    Parameters:
+    - values (np.ndarray): Float array of prices, modified in place.
+
+    Returns:
+    - np.ndarray: The same array rounded to 2 d.p.
+    """
+    np.multiply(values, 100, out=values)
+    np.rint(values, out=values)
+    np.divide(values, 100, out=values)
+    return values
+
+
+def _centered_moving_average(times: np.ndarray, values: np.ndarray, target_times: np.ndarray,
+                             window: int) -> np.ndarray:
+    """
+    Computes a centered moving average of every column of a 2D array at the given timestamps,
+    matching pandas' rolling(center=True, window=window, min_periods=1).mean() over the series
+    reindexed to every minute. Neighbours are looked up by timestamp, so minutes missing from the
+    data count as NaN without the series having to be reindexed. NaNs are skipped, so a value is
+    NaN only when its whole window is NaN.
+
+    Parameters:
+    - times (np.ndarray): Sorted datetime64 timestamps of the rows in values.
+    - values (np.ndarray): 2D array of shape (n_rows, n_columns).
+    - target_times (np.ndarray): Timestamps to compute the moving average for.
+    - window (int): The window size for the moving average.
+
+    Returns:
+    - np.ndarray: Array of shape (len(target_times), n_columns) holding the moving averages.
+    """
+    sums = np.zeros((len(target_times), values.shape[1]))
+    counts = np.zeros((len(target_times), values.shape[1]))
+
+    # Accumulate the neighbours of each timestamp within the window, pandas centers a window of size w
+    # on [i - w // 2, i + (w - 1) // 2]
+    for offset in range(-(window // 2), (window - 1) // 2 + 1):
+        neighbour_times = target_times + offset * MINUTE
+        positions = np.minimum(np.searchsorted(times, neighbour_times), len(times) - 1)
+        neighbours = values[positions]
+        valid = (times[positions] == neighbour_times)[:, None] & ~np.isnan(neighbours)
+        sums += np.where(valid, neighbours, 0.0)
+        counts += valid
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def _gap_times(times: np.ndarray, window: int, end: np.datetime64) -> np.ndarray:
+    """
+    Finds the missing minutes of a sorted series up to the end of its grid that a centered moving
+    average of size window can impute. Only minutes with an existing row inside their window can get
+    a value, the rest of a longer gap would be dropped as NaN again, so they are never generated.
+
+    Parameters:
+    - times (np.ndarray): Sorted datetime64 timestamps on a 1 minute grid.
+    - window (int): The window size for the moving average.
+    - end (np.datetime64): The last minute of the grid, at or after the last timestamp.
+
+    Returns:
+    - np.ndarray: Sorted datetime64 timestamps of the imputable missing minutes.
+    """
+    diffs = np.diff(times)
+    gap_rows = np.flatnonzero(diffs > MINUTE)
+    gap_lengths = diffs[gap_rows] // MINUTE - 1
+
+    # A missing minute is reached by the row before its gap within window // 2 minutes and by the
+    # row after its gap within (window - 1) // 2 minutes
+    gap_times = [times[gap_rows[gap_lengths >= step]] + step * MINUTE for step in range(1, window // 2 + 1)]
+    gap_times += [times[gap_rows[gap_lengths >= step] + 1] - step * MINUTE for step in range(1, (window - 1) // 2 + 1)]
+
+    # The minutes after the last row up to the end of the grid are only reached by the last row
+    trailing_steps = min((end - times[-1]) // MINUTE, window // 2)
+    if trailing_steps > 0:
+        gap_times.append(times[-1] + np.arange(1, trailing_steps + 1) * MINUTE)
+    return np.unique(np.concatenate(gap_times)) if gap_times else times[:0]
+
+
 def process_and_impute_ohlc_data_with_ma(df: pd.DataFrame, ma_window: int = 3) -> pd.DataFrame:
     """
     Generates centered moving averages of window size ma_window for each OHLC column,
-    the time index for each df is expanded to generate all time indices between the
-    maximum and minimum values in the dataframe and fill in the missing spaces. Where
-    there are gaps, these are filled in with the moving average value and any remaining 
-    NaN rows (where a moving average could not be generated) are dropped, alongside the 
-    temporary moving average columns.    
+    the time index for each df is expanded with the missing minutes between the
+    maximum and minimum values in the dataframe that lie within a moving average window
+    of existing data. These gaps and any missing values are filled in with the moving
+    average value and any remaining NaN rows (where a moving average could not be
+    generated) are dropped.
 
     Parameters:
     - df (pd.DataFrame): OHLC data to process.
@@ -64,24 +204,52 @@ def process_and_impute_ohlc_data_with_ma(df: pd.DataFrame, ma_window: int = 3) -
     - pd.DataFrame: Processed and imputed DataFrame with aligned OHLC data.
     """
 
-    # Reindex DataFrame to cover any missing time intervals
-    full_time_index = pd.date_range(start=df.index.min(), end=df.index.max(), freq='min')
-    df = df.reindex(full_time_index)
-
-    # Calculate moving averages for each specified column
-    for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-        ma_col_name = f'MA_{col}'
-        df[ma_col_name] = df[col].rolling(center=True, window=ma_window, min_periods=1).mean()
-
-    # Impute missing values using moving averages
-    for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-        ma_col = f'MA_{col}'
-        df[col] = df[col].fillna(df[ma_col])
-
-    # Drop temporary moving average columns, any remaining NaNs and round the OHLC to 2 d.p.
-    df.drop(columns=[f'MA_{col}' for col in ['Open', 'High', 'Low', 'Close', 'Volume']], inplace=True)
+    # Keep only the rows on the 1 minute grid starting at the first timestamp, as reindexing to
+    # every minute from the first to the last timestamp would have dropped any rows off that grid.
+    # The full reindex also created a NaN row for every missing minute, only to drop the rows the
+    # moving average couldn't fill, so only the imputable gap rows are inserted below instead. The
+    # grid ends at its last minute before the last timestamp, which may be one of the dropped rows
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    times = df.index.to_numpy()
+    grid_end = times[0] + (times[-1] - times[0]) // MINUTE * MINUTE
+    on_grid = (times - times[0]) % MINUTE == np.timedelta64(0)
+    if not on_grid.all():
+        df = df[on_grid]
+        times = times[on_grid]
+
+    # Rows are only created for the imputable missing minutes instead of reindexing to every minute,
+    # the rest of each gap has no data in its window. If the frame has columns other than OHLCV these
+    # would be NaN in the created rows, so they would be dropped and are not created at all. Their
+    # moving averages are taken before any values are imputed, as values may share memory with df
+    values = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    gap_df = None
+    if df.columns.difference(OHLCV_COLUMNS).empty:
+        gap_times = _gap_times(times, ma_window, grid_end)
+        if gap_times.size:
+            gap_df = pd.DataFrame(_centered_moving_average(times, values, gap_times, ma_window),
+                                  index=pd.DatetimeIndex(gap_times), columns=OHLCV_COLUMNS)
+
+    # Calculate moving averages for all OHLCV columns in one pass over the rows with missing values
+    # and impute the missing values with them. Only the imputed cells are written back, so no moving
+    # average columns or full size copies of the OHLCV block are created
+    missing = np.isnan(values)
+    missing_rows = np.flatnonzero(missing.any(axis=1))
+    if missing_rows.size:
+        moving_averages = _centered_moving_average(times, values, times[missing_rows], ma_window)
+        for col_idx, col in enumerate(OHLCV_COLUMNS):
+            col_missing = missing[missing_rows, col_idx]
+            if col_missing.any():
+                df.iloc[missing_rows[col_missing], df.columns.get_loc(col)] = moving_averages[col_missing, col_idx]
+
+    # Insert the imputed gap rows
+    if gap_df is not None:
+        df = pd.concat([df, gap_df[df.columns]]).sort_index()
+
+    # Drop any remaining NaNs and round the OHLC to 2 d.p.
     df.dropna(inplace=True)
-    df[['Open', 'High', 'Low', 'Close']] = df[['Open', 'High', 'Low', 'Close']].round(2)
+    for col in PRICE_COLUMNS:
+        df[col] = round_prices(df[col].to_numpy(dtype=np.float64, copy=True))
 
     return df
 
@@ -90,26 +258,113 @@ def fix_open_close_alignment(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aligns the 'Open' and 'Close' values in OHLC data to ensure the 'Open' value 
     of each candle matches the 'Close' value of the previous candle. This corrects 
-    misalignment caused by exchange data errors or averaging.
+    misalignment caused by exchange data errors or averaging. The frame is modified
+    in place rather than copied, and returned for convenience.
 
     Parameters:
     - df (pd.DataFrame): OHLC data with potentially misaligned 'Open' and 'Close' values.
 
     Returns:
-    - pd.DataFrame: DataFrame with aligned 'Open' and 'Close' values.
+    - pd.DataFrame: The same DataFrame with aligned 'Open' and 'Close' values.
+    """
+
+    # Shift 'Close' values one time index ahead and set 'Open' to these values, keeping the first 'Open'
+    close_values = df['Close'].to_numpy()
+    open_values = np.empty(len(df))
+    open_values[0] = df['Open'].iat[0]
+    open_values[1:] = close_values[:-1]
+    df['Open'] = open_values
+
+    # Apply 'High/Low' fix if 'Open' has been moved outside one of them
+    return enforce_high_low(df)
+
+
+def enforce_high_low(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ensures 'High' and 'Low' remain the extrema of each candle's 'Open', 'High', 'Low' and 'Close'
+    values. fmax/fmin skip NaNs like the row-wise DataFrame max/min, without building a temporary
+    4 column frame. The frame is modified in place and returned for convenience.
+
+    Parameters:
+    - df (pd.DataFrame): OHLC data.
+
+    Returns:
+    - pd.DataFrame: The same DataFrame with 'High' and 'Low' covering 'Open' and 'Close'.
+    """
+    open_values, close_values = df['Open'].to_numpy(), df['Close'].to_numpy()
+
+    # 'Low' is taken against the corrected 'High'
+    high_values = np.fmax.reduce([open_values, close_values, df['High'].to_numpy(), df['Low'].to_numpy()])
+    df['High'] = high_values
+    df['Low'] = np.fmin.reduce([open_values, close_values, high_values, df['Low'].to_numpy()])
+
+    return df
+
+
+def prepare_exchange_data(exchange: str, filepath: str, last_timestamp: Optional[datetime]) -> pd.DataFrame:
+    """
+    Loads the new OHLC data of a single exchange and prepares it for combining, the data is
+    indexed by 'Open time', Bitstamp data has its 'Open' and 'Close' values aligned and small
+    gaps are imputed with a moving average.
+
+    Parameters:
+    - exchange (str): Name of the exchange.
+    - filepath (str): Path to the file containing the exchange's OHLC data.
+    - last_timestamp (datetime): Timestamp to filter data from; only data newer
+      than this timestamp will be loaded.
+
+    Returns:
+    - pd.DataFrame: Prepared OHLC data indexed by 'Open time'.
     """
+    df = load_new_data(filepath, last_timestamp)
+
+    # Index by 'Open time', assigning the index directly skips the checks and column copy of set_index
+    open_times = df['Open time'].to_numpy()
+    df = df.drop(columns='Open time')
+    df.index = pd.DatetimeIndex(open_times)
+    if df.empty:
+        return df
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
 
-    # Shift 'Close' values one time index ahead and set 'Open' to these values
-    first_open_value = df.loc[df.index[0], 'Open']
-    df_fixed = df.copy()
-    df_fixed['Open'] = df_fixed['Close'].shift(1)
-    df_fixed.loc[df_fixed.index[0], 'Open'] = first_open_value
+    # Apply 'fix_open_close_alignment' only for 'Bitstamp' exchange data
+    if exchange == 'Bitstamp':
+        df = fix_open_close_alignment(df)
+
+    # Impute gaps with a moving average, ensure that High and Low remain the extrema values in these gaps
+    df = process_and_impute_ohlc_data_with_ma(df, 3)
+    return enforce_high_low(df)
 
-    # Apply 'High/Low' fix if 'Open' has been moved outside one of them.
-    df_fixed['High'] = df_fixed[['Open', 'Close', 'High', 'Low']].max(axis=1)
-    df_fixed['Low'] = df_fixed[['Open', 'Close', 'High', 'Low']].min(axis=1)
 
-    return df_fixed
+def _combine_time_indexes(indexes: List[pd.DatetimeIndex]) -> Tuple[pd.DatetimeIndex, List[np.ndarray]]:
+    """
+    Builds the union of the exchanges' time indexes and the positions of each exchange's timestamps in it.
+    The union is taken on the full minute range shared by all exchanges, marking the minutes of each
+    exchange by their offset from the shared start, which avoids merging the indexes pairwise and looking
+    every timestamp up again. Indexes that are not on the shared minute grid fall back to a pandas union.
+
+    Parameters:
+    - indexes (List[pd.DatetimeIndex]): Sorted time indexes of the exchanges.
+
+    Returns:
+    - Tuple[pd.DatetimeIndex, List[np.ndarray]]: The combined time index and, for each exchange, the
+      positions of its timestamps in the combined index.
+    """
+    start = min(index[0] for index in indexes).to_datetime64()
+    deltas = [index.to_numpy() - start for index in indexes]
+    if any((delta % MINUTE != np.timedelta64(0)).any() for delta in deltas):
+        combined_index = reduce(lambda index, other: index.union(other), indexes)
+        return combined_index, [combined_index.get_indexer(index) for index in indexes]
+
+    # Mark the minutes of the shared range any exchange has data for, the running count of marked
+    # minutes then maps each minute offset to its position in the combined index
+    offsets = [delta // MINUTE for delta in deltas]
+    seen = np.zeros(max(offset[-1] for offset in offsets) + 1, dtype=bool)
+    for offset in offsets:
+        seen[offset] = True
+    positions = np.cumsum(seen) - 1
+    combined_index = pd.DatetimeIndex(start + np.flatnonzero(seen) * MINUTE)
+    return combined_index, [positions[offset] for offset in offsets]
 
 
 def process_ohlc_data(trading_pair: str, exchange_list: List[str]) -> None:
@@ -129,45 +384,57 @@ def process_ohlc_data(trading_pair: str, exchange_list: List[str]) -> None:
     - None. Saves combined and processed OHLC data to a file.
     """
     combined_file = f'data/ohlc/{trading_pair}/{trading_pair}_1m_Combined_Index.pkl'
-    last_timestamp = get_last_timestamp(combined_file)
+    existing_df, last_timestamp = load_combined_data(combined_file)
     
-    # Load new data for each exchange in the list
-    filename_patterns = {exchange: f"data/ohlc/{trading_pair}/{trading_pair}_1m_{exchange}.pkl" for exchange in exchange_list}
-    dfs = {exchange: load_new_data(filepath, last_timestamp) for exchange, filepath in filename_patterns.items()}
+    # Load and prepare new data for each exchange in the list. Exchanges are independent and most of
+    # the loading and NumPy work releases the GIL, so they are prepared concurrently. Exchanges are
+    # sorted so the exchange axis of the averaging, and so the result, doesn't depend on the list order
+    filename_patterns = {exchange: f"data/ohlc/{trading_pair}/{trading_pair}_1m_{exchange}.pkl" for exchange in sorted(exchange_list)}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(filename_patterns)) as executor:
+        prepared = executor.map(lambda item: prepare_exchange_data(item[0], item[1], last_timestamp), filename_patterns.items())
+        dfs = dict(zip(filename_patterns, prepared))
+
+    # Skip exchanges without new data, and the whole pair if none have any. If the history had to be
+    # loaded for its last timestamp, the sidecar is written so the next run can skip loading it
+    dfs = {exchange: df for exchange, df in dfs.items() if not df.empty}
+    if not dfs:
+        if existing_df is not None:
+            save_last_timestamp(combined_file, last_timestamp)
+        print(f"No new data for {trading_pair}, skipping.")
+        return
+
+    # Combine all exchanges on the union of their timestamps, staging the prices once as a single
+    # (4, n_timestamps, n_exchanges) array and the volumes as (n_timestamps, n_exchanges). Missing candles
+    # are left as zero with a separate presence mask, imputed exchange data has no NaNs, so zero volume
+    # drops them out of the weighted sums without NaN aware reductions copying the arrays. The positions
+    # of each exchange in the union are found once and shared by all fields
+    combined_index, exchange_positions = _combine_time_indexes([df.index for df in dfs.values()])
+    price_values = np.zeros((len(PRICE_COLUMNS), len(combined_index), len(dfs)))
+    volume_values = np.zeros((len(combined_index), len(dfs)))
+    present = np.zeros((len(combined_index), len(dfs)), dtype=bool)
+    for exchange_idx, (df, positions) in enumerate(zip(dfs.values(), exchange_positions)):
+        present[positions, exchange_idx] = True
+        volume_values[positions, exchange_idx] = df['Volume'].to_numpy()
+        for field_idx, col in enumerate(PRICE_COLUMNS):
+            price_values[field_idx, positions, exchange_idx] = df[col].to_numpy()
+
+    # Aggregate 'Volume' and compute weighted averages for all OHLC values in a single einsum, which
+    # contracts the prices with the volumes without materializing their product
+    volume_sum = volume_values.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weighted_avgs = np.einsum('fij,ij->fi', price_values, volume_values) / volume_sum
+
+        # Impute any remaining NaN values (zero total volume) using a simple mean across exchanges
+        nan_values = np.isnan(weighted_avgs)
+        if nan_values.any():
+            nan_rows = nan_values.any(axis=0)
+            means = price_values[:, nan_rows].sum(axis=2) / present[nan_rows].sum(axis=1)
+            weighted_avgs[:, nan_rows] = np.where(nan_values[:, nan_rows], means, weighted_avgs[:, nan_rows])
+
+    # Round the OHLC to 2 d.p. before building the combined frame
+    final_df = pd.DataFrame({'Volume': volume_sum, **dict(zip(PRICE_COLUMNS, round_prices(weighted_avgs)))},
+                            index=combined_index)
 
-    # Apply 'fix_open_close_alignment' only for 'Bitstamp' exchange data
-    for exchange in dfs:
-        dfs[exchange].set_index('Open time', inplace=True)
-        if exchange == 'Bitstamp':
-            dfs[exchange] = fix_open_close_alignment(dfs[exchange])
-
-    # Impute gaps with a moving average, ensure that High and Low remain the extrema values in these gaps
-    for exchange in dfs:
-        dfs[exchange] = process_and_impute_ohlc_data_with_ma(dfs[exchange], 3)
-        dfs[exchange]['High'] = dfs[exchange][['Open', 'Close', 'High', 'Low']].max(axis=1)
-        dfs[exchange]['Low'] = dfs[exchange][['Open', 'Close', 'High', 'Low']].min(axis=1)
-
-    # Combine all DataFrames from different exchanges
-    combined_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys(), join='outer')
-
-    # Aggregate 'Volume' and compute weighted averages for OHLC values
-    final_df = pd.DataFrame(index=combined_df.index)
-    final_df['Volume'] = combined_df.xs('Volume', axis=1, level=1).sum(axis=1)
-
-    for col in ['Open', 'High', 'Low', 'Close']:
-        ohlc_columns = combined_df.xs(col, axis=1, level=1)
-        volume_columns = combined_df.xs('Volume', axis=1, level=1)
-        weighted_avg = (ohlc_columns * volume_columns).sum(axis=1) / volume_columns.sum(axis=1)
-        final_df[col] = weighted_avg
-
-    # Impute any remaining NaN values using a simple mean across exchanges
-    for col in ['Open', 'High', 'Low', 'Close']:
-        nan_rows = final_df[col].isna()
-        if nan_rows.any():
-            simple_mean = combined_df.xs(col, axis=1, level=1).mean(axis=1)
-            final_df.loc[nan_rows, col] = simple_mean[nan_rows]
-
-    final_df[['Open', 'High', 'Low', 'Close']] = final_df[['Open', 'High', 'Low', 'Close']].round(2)
     # Align 'Open' and 'Close' values and reset the index
     final_df = fix_open_close_alignment(final_df)
     final_df.reset_index(inplace=True, names='Open time')
@@ -176,24 +443,40 @@ def process_ohlc_data(trading_pair: str, exchange_list: List[str]) -> None:
     csv_file = f'data/ohlc_csv/{trading_pair}/{trading_pair}_1m_Combined_Index.csv'
     save_data(final_df, csv_file, file_type='csv')
 
-    if last_timestamp:
-        existing_df = load_data(combined_file)
+    # Append the new rows to the existing history, the csv above only appended the new rows. The history
+    # is only loaded now if its last timestamp came from the sidecar
+    if last_timestamp is not None:
+        if existing_df is None:
+            existing_df = load_data(combined_file)
         final_df = pd.concat([existing_df, final_df], ignore_index=True)
 
     save_data(final_df, combined_file)
+    save_last_timestamp(combined_file, final_df['Open time'].max())
 
 
-# Create a mapping of trading pairs to the exchanges providing data for each pair
-# i.e. generate list of all exchanges that have data for a particular currency
-asset_exchange_map = {}
-
-for exchange in API_CONFIG:
-    pair_keys = list(API_CONFIG[exchange]['pairs'].keys())
-    for trading_pair in pair_keys:
-        if trading_pair not in asset_exchange_map:
-            asset_exchange_map[trading_pair] = []
-        asset_exchange_map[trading_pair].append(exchange)
+def main() -> None:
+    """
+    Main function to combine the OHLC data of every trading pair across the exchanges providing it.
 
-# Process data for each trading pair across associated exchanges
-for trading_pair, exchange_list in asset_exchange_map.items():
-    process_ohlc_data(trading_pair, exchange_list)
+    Returns:
+    - None
+    """
+    # Create a mapping of trading pairs to the exchanges providing data for each pair
+    # i.e. generate list of all exchanges that have data for a particular currency
+    asset_exchange_map = {}
+    for exchange in API_CONFIG:
+        for trading_pair in API_CONFIG[exchange]['pairs']:
+            asset_exchange_map.setdefault(trading_pair, []).append(exchange)
+
+    # Process data for each trading pair across associated exchanges. Pairs read and write distinct files,
+    # so they are processed in separate processes as the imputation and averaging are CPU-bound, each
+    # pair still prepares its exchanges on threads
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(process_ohlc_data, trading_pair, exchange_list)
+                   for trading_pair, exchange_list in asset_exchange_map.items()]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
+if __name__ == "__main__":
+    main()
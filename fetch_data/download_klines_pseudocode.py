@@ -106,8 +106,9 @@ def fetch_klines(config: DataFetchConfig, start_datetime: datetime, end_datetime
     formatting a request to the exchange, fetching the URL from API_CONFIG, formatting the header 
     parameters using 'construct_params' and dealing with retries in case of request errors. It also 
     parses the variable content from exchange returns and formats the kline data into a standardized 
-    list to make the return exchange agnostic. "construct_params" is a lambda function in the API_CONFIG
-    please consult the config to see exchange specific logic for constructing start/end_datetime.
+    list to make the return exchange agnostic. "construct_params" is a function in the API_CONFIG built from
+    each exchange's '_make_<exchange>_params' factory, please consult the config to see exchange specific
+    logic for constructing start/end_datetime.
     """
 
 
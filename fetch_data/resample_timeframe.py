@@ -1,91 +1,175 @@
-from pandas import to_datetime
+import concurrent.futures
+import os
 
-from utils.file_utils import load_data, save_data
+import numpy as np
+from pandas import DataFrame, DatetimeIndex, concat, isna, to_datetime
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick, Day
+
+from utils.file_utils import load_data, save_data, create_path
 from fetch_data.api_config_v3 import API_CONFIG
 
+SAVE_MAX_WORKERS = 8  # Maximum concurrent file saves
+
+# Aggregation rules of each exchange's columns, defined once rather than on every resample. Only these columns are
+# kept in the resampled data, Binance's 'Ignore' placeholder column is left out rather than summed
+AGGREGATION_RULES = {
+    'Binance': {
+        'Open time': 'first',
+        'Close time': 'last',
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum',
+        'Quote asset volume': 'sum',
+        'Number of trades': 'sum',
+        'Taker buy base asset volume': 'sum',
+        'Taker buy quote asset volume': 'sum'
+    },
+    'Coinbase': {
+        'Open time': 'first',
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    },
+    'OKX': {
+        'Open time': 'first',
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum',
+        'Volume (Currency)': 'sum',
+        'Volume (Quote)': 'sum',
+        'Confirm': 'sum'
+    },
+    'Combined_Index': {
+        'Open time': 'first',
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    },
+    'Bitfinex': {
+        'Open time': 'first',
+        'Open': 'first',
+        'Close': 'last',
+        'High': 'max',
+        'Low': 'min',
+        'Volume': 'sum'
+    },
+    'KuCoin': {
+        'Open time': 'first',
+        'Open': 'first',
+        'Close': 'last',
+        'High': 'max',
+        'Low': 'min',
+        'Volume': 'sum',
+        'Amount': 'sum'
+    },
+    'BitMEX': {
+        'Open time': 'first',
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    },
+    'Bitstamp': {
+        'Open time': 'first',
+        'Open': 'first',
+        'Close': 'last',
+        'High': 'max',
+        'Low': 'min',
+        'Volume': 'sum'
+    }
+}
+
+
+# Columns of each exchange grouped by their reduction, so pandas runs each reduction once over its columns rather
+# than dispatching the aggregation rules column by column
+AGGREGATION_GROUPS = {}
+for _exchange, _rules in AGGREGATION_RULES.items():
+    for _column, _how in _rules.items():
+        AGGREGATION_GROUPS.setdefault(_exchange, {}).setdefault(_how, []).append(_column)
+
+# NumPy ufuncs reducing each period's rows for the reductions of the aggregation rules, fmax/fmin skip NaNs
+BUCKET_REDUCERS = {'max': np.fmax, 'min': np.fmin, 'sum': np.add}
+
+
+def reduce_buckets(df, period, rules):
+    """
+    Resample sorted data into fixed length periods in a single vectorized pass per column. The rows of
+    each period are contiguous, so its first/last values are taken by position and its max/min/sum with
+    ufunc.reduceat over the period boundaries. Missing values are skipped like pandas does, and periods
+    left without a value in any column are dropped. Periods start from midnight of the first day like
+    pandas' default resample origin. Returns None if the data doesn't allow it (unsorted or non numeric
+    reductions), to resample with pandas.
+    """
+    times = df.index.to_numpy()
+    if not len(times) or not isinstance(df.index.dtype, np.dtype) or not df.index.is_monotonic_increasing:
+        return None
+
+    # Find the first and last row of each period with data
+    bucket_ids = (times - times[0].astype('datetime64[D]')) // np.timedelta64(to_offset(period).nanos, 'ns')
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket_ids)) + 1))
+    ends = np.append(starts[1:], len(times)) - 1
+
+    columns = {}
+    complete = np.ones(len(starts), dtype=bool)
+    for column, how in rules.items():
+        values = df[column].to_numpy()
+        if values.dtype.kind not in 'iufM' or (how in BUCKET_REDUCERS and values.dtype.kind == 'M'):
+            return None
+        missing = isna(values) if values.dtype.kind in 'fM' else None
+        if missing is None or not missing.any():
+            rows = starts if how == 'first' else ends
+        elif how in ('first', 'last'):
+            # Take the first/last present row of each period, periods without one are dropped
+            present = np.flatnonzero(~missing)
+            if how == 'first':
+                positions = np.searchsorted(present, starts)
+                found = positions < len(present)
+            else:
+                positions = np.searchsorted(present, ends, side='right') - 1
+                found = positions >= 0
+            rows = present[np.clip(positions, 0, len(present) - 1)] if len(present) else starts
+            found &= (rows >= starts) & (rows <= ends)
+            complete &= found
+        else:
+            values = np.where(missing, 0, values) if how == 'sum' else values
+            rows = None
+
+        if how in ('first', 'last'):
+            columns[column] = values[rows]
+        else:
+            columns[column] = BUCKET_REDUCERS[how].reduceat(values, starts)
+            if how != 'sum' and missing is not None:
+                complete &= ~np.isnan(columns[column])
+
+    if not complete.all():
+        columns = {column: values[complete] for column, values in columns.items()}
+    return DataFrame(columns)
+
 
 def resample_data(df, period, exchange):
     """Resample the dataframe according to the given period."""
-    # Define the aggregation rules based on the exchange
-    aggregation_rules = {
-        'Binance': {
-            'Open time': 'first',
-            'Close time': 'last',
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum',
-            'Quote asset volume': 'sum',
-            'Number of trades': 'sum',
-            'Taker buy base asset volume': 'sum',
-            'Taker buy quote asset volume': 'sum',
-            'Ignore': 'sum'
-        },
-        'Coinbase': {
-            'Open time': 'first',
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum'
-        },
-        'OKX': {
-            'Open time': 'first',
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum',
-            'Volume (Currency)': 'sum',
-            'Volume (Quote)': 'sum',
-            'Confirm': 'sum'
-        },
-        'Combined_Index': {
-            'Open time': 'first',
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum'
-        },
-        'Bitfinex': {
-            'Open time': 'first',
-            'Open': 'first',
-            'Close': 'last',
-            'High': 'max',
-            'Low': 'min',
-            'Volume': 'sum'
-        },
-        'KuCoin': {
-            'Open time': 'first',
-            'Open': 'first',
-            'Close': 'last',
-            'High': 'max',
-            'Low': 'min',
-            'Volume': 'sum',
-            'Amount': 'sum'
-        },
-        'BitMEX': {
-            'Open time': 'first',
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum'
-        },
-        'Bitstamp': {
-            'Open time': 'first',
-            'Open': 'first',
-            'Close': 'last',
-            'High': 'max',
-            'Low': 'min',
-            'Volume': 'sum'
-        }
-    }
+    # Fixed length periods of sorted data are reduced directly, which matches pandas' result after dropping
+    # the incomplete periods (up to the summation order of floats, pandas sums with Kahan compensation)
+    if isinstance(to_offset(period), (Tick, Day)):
+        df_resampled = reduce_buckets(df, period, AGGREGATION_RULES[exchange])
+        if df_resampled is not None:
+            return df_resampled
 
-    # Resample using the appropriate aggregation rules for the exchange
-    df_resampled = df.resample(period).agg(aggregation_rules[exchange])
+    # Resample using the appropriate aggregation rules for the exchange, a single call per reduction, and restore
+    # the order of the rules' columns
+    resampler = df.resample(period)
+    df_resampled = concat([getattr(resampler[columns], how)() for how, columns in AGGREGATION_GROUPS[exchange].items()],
+                          axis=1)[list(AGGREGATION_RULES[exchange])]
 
     # Remove rows with NaT or NaN values
     df_resampled.dropna(inplace=True)
@@ -95,24 +179,37 @@ def resample_data(df, period, exchange):
     return df_resampled
 
 
-# Main function to automate resampling
-def main():
-    asset_exchange_map = {}
+def resample_periods_data(df, periods, exchange):
+    """Resample the 1 minute data to each of the periods, yielding each period with its resampled data."""
+    # The periods are in ascending order and fixed length periods split evenly into the longer ones, so each is
+    # resampled from the previous fixed period's result rather than the 1 minute data (first/last/max/min/sum
+    # combine over sub-periods). This only holds if no sub-period was dropped for missing values, so data with
+    # missing values is resampled from the 1 minute data. Calendar periods ('1W', '1ME') are closed on the right
+    # and don't nest, they are always resampled from the 1 minute data
+    chain = not df[list(AGGREGATION_RULES[exchange])].isna().to_numpy().any()
+    df_shorter = df
+    for period in periods:
+        is_fixed = isinstance(to_offset(period), (Tick, Day))
+        df_resampled = resample_data(df_shorter if is_fixed else df, period, exchange)
+        yield period, df_resampled
+        if is_fixed and chain:
+            df_shorter = df_resampled.set_axis(DatetimeIndex(df_resampled['Open time'], name='resample_time'))
 
-    for exchange in API_CONFIG:
-        pair_keys = list(API_CONFIG[exchange]['pairs'].keys())
-        for ticker in pair_keys:
-            if ticker not in asset_exchange_map:
-                asset_exchange_map[ticker] = []
-            asset_exchange_map[ticker].append(exchange)
 
-    # Append 'Combined_Index' to every key in asset_exchange_map
-    for ticker in asset_exchange_map:
-        asset_exchange_map[ticker].append('Combined_Index')
+def save_resampled_data(df_resampled, ticker, period, file_name):
+    """Save resampled data as a pickle file and as its CSV mirror."""
+    save_data(df_resampled, f'data/ohlc/{ticker}/{period}/{file_name}.pkl')
+    save_data(df_resampled, f'data/ohlc_csv/{ticker}/{period}/{file_name}.csv', file_type='csv', append_if_exists=False,
+              incremental_key='Open time')
 
 
-    # Iterate over each trading pair and its exchanges
-    for ticker, exchanges in asset_exchange_map.items():
+def process_ticker(ticker, exchanges):
+    """Resample and save the 1 minute data of a trading pair from each of its exchanges."""
+    # Files are saved on a thread pool, so writing the results of one exchange overlaps loading and resampling
+    # the next, rather than blocking on each write in turn
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SAVE_MAX_WORKERS) as executor:
+        pending_saves = {}
+
         for exchange in exchanges:
             # Define the resample periods and corresponding file names
             resample_periods = {
@@ -125,22 +222,46 @@ def main():
                 # '1W': f'{ticker}_1w_{exchange}',
                 # '1ME': f'{ticker}_1Mo_{exchange}'
             }
-            # Load the data for the specific ticker and exchange
-            try:
-                df = load_data(f'data/ohlc/{ticker}/1m/{ticker}_1m_{exchange}.pkl')
-                df['resample_time'] = to_datetime(df['Open time'])
-                df.set_index('resample_time', inplace=True)
-                
-                # Resample and save data for each period
-                for period, file_template in resample_periods.items():
-                    df_resampled = resample_data(df, period, exchange)
-                    file_name = file_template.format(ticker=ticker, exchange=exchange)
-                    save_data(df_resampled, f'data/ohlc/{ticker}/{period}/{file_name}.pkl')
-                    save_data(df_resampled, f'data/ohlc_csv/{ticker}/{period}/{file_name}.csv', file_type='csv', append_if_exists=False)
-                    print(f"Resampled data saved for {ticker} on {exchange} at {period} interval.")
-            
-            except FileNotFoundError:
+            # Load the data for the specific ticker and exchange, most exchanges don't list every ticker so
+            # missing files are checked for rather than raising and catching an error for each
+            source_file = f'data/ohlc/{ticker}/1m/{ticker}_1m_{exchange}.pkl'
+            if not os.path.isfile(create_path(source_file, log_info=False)):
                 print(f"Data file for {ticker} on {exchange} not found. Skipping.")
+                continue
+            df = load_data(source_file)
+            # Assign the index directly rather than adding a column and moving it with set_index
+            df.index = DatetimeIndex(to_datetime(df['Open time'], cache=True), name='resample_time')
+        
+            # Resample and save data for each period
+            for period, df_resampled in resample_periods_data(df, resample_periods, exchange):
+                file_name = resample_periods[period].format(ticker=ticker, exchange=exchange)
+                future = executor.submit(save_resampled_data, df_resampled, ticker, period, file_name)
+                pending_saves[future] = f"Resampled data saved for {ticker} on {exchange} at {period} interval."
+
+        # Wait for the outstanding saves, re-raising any error
+        for future in concurrent.futures.as_completed(pending_saves):
+            future.result()
+            print(pending_saves[future])
+
+
+# Main function to automate resampling
+def main():
+    asset_exchange_map = {}
+    for exchange in API_CONFIG:
+        for ticker in API_CONFIG[exchange]['pairs']:
+            asset_exchange_map.setdefault(ticker, []).append(exchange)
+
+    # Append 'Combined_Index' to every key in asset_exchange_map
+    for ticker in asset_exchange_map:
+        asset_exchange_map[ticker].append('Combined_Index')
+
+
+    # Tickers are independent and read and write their own files, so they are resampled in separate
+    # processes as resampling is CPU-bound
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(process_ticker, ticker, exchanges) for ticker, exchanges in asset_exchange_map.items()]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
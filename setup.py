@@ -9,10 +9,10 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=[  
-        "dataframe_image==0.2.5",
         "kaggle==1.6.17",
         "matplotlib==3.9.2",
         "pandas==2.2.2",
+        "pyarrow==17.0.0",
         "requests==2.32.3",
         "setuptools==75.1.0",
         "typing_extensions==4.12.2", 
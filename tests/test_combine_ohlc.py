@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from fetch_data.combine_ohlc import OHLCV_COLUMNS, process_and_impute_ohlc_data_with_ma
+
+
+def reindex_and_impute(df, ma_window=3):
+    """The reindex based imputation that process_and_impute_ohlc_data_with_ma replaced."""
+    df = df.reindex(pd.date_range(start=df.index.min(), end=df.index.max(), freq='min'))
+    for col in OHLCV_COLUMNS:
+        df[col] = df[col].fillna(df[col].rolling(center=True, window=ma_window, min_periods=1).mean())
+    df = df.dropna()
+    df[['Open', 'High', 'Low', 'Close']] = df[['Open', 'High', 'Low', 'Close']].round(2)
+    return df
+
+
+def make_ohlcv(rng, rows=300):
+    """Random 1 minute OHLCV data with gaps, missing values, off grid rows and shuffled rows."""
+    times = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.choice(rows * 2, rows, replace=False)), unit='min')
+    off_grid = rng.random(rows) < 0.05
+    off_grid[-1] = rng.random() < 0.5
+    times = times + pd.to_timedelta(np.where(off_grid & (np.arange(rows) > 0), 30, 0), unit='s')
+    values = 100 + rng.normal(0, 1, (rows, len(OHLCV_COLUMNS)))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    df = pd.DataFrame(values, index=pd.DatetimeIndex(times), columns=OHLCV_COLUMNS)
+    return df.iloc[rng.permutation(rows)]
+
+
+class ProcessAndImputeTest(unittest.TestCase):
+    def test_matches_reindex_with_unsorted_and_off_grid_rows(self):
+        rng = np.random.default_rng(0)
+        for ma_window in (3, 4, 5):
+            for _ in range(100):
+                df = make_ohlcv(rng)
+                expected = reindex_and_impute(df.copy(), ma_window)
+                result = process_and_impute_ohlc_data_with_ma(df.copy(), ma_window)
+                pd.testing.assert_frame_equal(result, expected, check_freq=False, check_names=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
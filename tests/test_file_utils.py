@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from utils.file_utils import load_data, save_data
+
+
+class SaveDataTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.df = pd.DataFrame({'Open time': pd.date_range('2024-01-01', periods=3, freq='h'), 'Close': [1.5, 2.5, 3.5]})
+
+    def test_directory_removed_after_save_is_created_again(self):
+        for file_type in ('pickle', 'csv', 'parquet'):
+            file_path = os.path.join(self.directory, file_type, 'BTCUSD', f'BTCUSD.{file_type}')
+            save_data(self.df, file_path, file_type=file_type, log_info=False)
+            shutil.rmtree(os.path.join(self.directory, file_type))
+
+            save_data(self.df, file_path, file_type=file_type, log_info=False)
+            loaded = load_data(file_path, file_type=file_type, log_info=False)
+            self.assertEqual(loaded['Close'].tolist(), [1.5, 2.5, 3.5])
+
+    def test_file_in_place_of_directory_raises(self):
+        blocker = os.path.join(self.directory, 'blocker')
+        open(blocker, 'w').close()
+        with self.assertRaises(FileExistsError):
+            save_data(self.df, os.path.join(blocker, 'BTCUSD.pkl'), log_info=False)
+
+
+class IncrementalCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.file_path = os.path.join(self.directory, 'BTCUSD_1d.csv')
+        self.df = pd.DataFrame({'Open time': pd.date_range('2024-01-01', periods=6, freq='D'),
+                                'Close': [1.5, 2.0, 3.25, 4.0, 5.5, 6.75], 'Volume': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0]})
+
+    def save(self, df):
+        save_data(df, self.file_path, file_type='csv', incremental_key='Open time', log_info=False)
+
+    def read(self):
+        with open(self.file_path) as f:
+            return f.read()
+
+    def test_update_matches_full_write(self):
+        partial = self.df.iloc[:4].copy()
+        partial.loc[3, 'Close'] = 3.9  # The last period was saved while still in progress
+        self.save(partial)
+        self.save(self.df)
+        self.assertEqual(self.read(), self.df.to_csv(index=False))
+
+    def test_header_mismatch_rewrites_instead_of_appending(self):
+        self.save(self.df.drop(columns=['Volume']))
+        self.save(self.df)
+        self.assertEqual(self.read(), self.df.to_csv(index=False))
+
+    def test_last_key_past_data_rewrites_instead_of_appending(self):
+        self.save(self.df)
+        self.save(self.df.iloc[:3])
+        self.assertEqual(self.read(), self.df.iloc[:3].to_csv(index=False))
+
+    def test_new_rows_formatted_like_the_file(self):
+        # A period starting after a gap isn't at midnight, so pandas writes every timestamp with its time
+        df = self.df.copy()
+        df.loc[1, 'Open time'] += pd.Timedelta(hours=9, minutes=20)
+        self.save(df.iloc[:3])
+        self.save(df)
+        self.assertEqual(self.read(), df.to_csv(index=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from fetch_data.resample_timeframe import resample_data, resample_periods_data
+
+
+def make_coinbase_1m(days=3, seed=0):
+    """Coinbase shaped 1 minute data indexed like process_ticker indexes it."""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2024-01-01', periods=days * 1440, freq='min')
+    close = 100 + np.cumsum(rng.normal(0, 0.3, len(times)))
+    open_ = close + rng.normal(0, 0.1, len(times))
+    df = pd.DataFrame({
+        'Open time': times,
+        'Open': open_,
+        'High': np.maximum(open_, close) + rng.random(len(times)),
+        'Low': np.minimum(open_, close) - rng.random(len(times)),
+        'Close': close,
+        'Volume': rng.random(len(times)),
+    })
+    df.index = pd.DatetimeIndex(df['Open time'], name='resample_time')
+    return df
+
+
+class ResamplePeriodsDataTest(unittest.TestCase):
+    def resample(self, df):
+        return dict(resample_periods_data(df, ['1h', '1d'], 'Coinbase'))
+
+    def test_chained_daily_matches_direct_without_missing_values(self):
+        df = make_coinbase_1m()
+        pd.testing.assert_frame_equal(self.resample(df)['1d'], resample_data(df, '1d', 'Coinbase'), rtol=1e-12)
+
+    def test_hour_with_missing_close_is_kept_in_daily(self):
+        df = make_coinbase_1m()
+        # Make the hour with the day's highest price and lowest price have no Close
+        day = df.index.normalize() == pd.Timestamp('2024-01-02')
+        df.loc[day & (df.index.hour == 5), 'High'] = 1_000
+        df.loc[day & (df.index.hour == 5), 'Low'] = 1
+        df.loc[day & (df.index.hour == 5), 'Close'] = np.nan
+
+        resampled = self.resample(df)
+        self.assertEqual(len(resampled['1h']), 3 * 24 - 1)
+        pd.testing.assert_frame_equal(resampled['1d'], resample_data(df, '1d', 'Coinbase'), rtol=1e-12)
+        self.assertEqual(resampled['1d']['High'].iloc[1], 1_000)
+        self.assertEqual(resampled['1d']['Low'].iloc[1], 1)
+        self.assertAlmostEqual(resampled['1d']['Volume'].iloc[1], df.loc[day, 'Volume'].sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
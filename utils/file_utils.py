@@ -1,5 +1,7 @@
 import os
+import csv
 import logging
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 
@@ -7,16 +9,17 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 
 def load_data(file_path: str, file_type: str = 'pickle', set_index: str = None, 
-              drop_columns: list = None, log_info: bool = True):
+              drop_columns: list = None, columns: list = None, log_info: bool = True):
     """
-    Load data from a file as a pickle dataframe, CSV, or numpy array, index columns can be set
+    Load data from a file as a pickle dataframe, CSV, Parquet, or numpy array, index columns can be set
     and columns can be dropped optionally.
 
     Parameters:
     file_path (str): The path to the file.
-    file_type (str): The data structure to load ('pickle', 'csv', or 'numpy'). Defaults to 'pickle'.
+    file_type (str): The data structure to load ('pickle', 'csv', 'parquet', or 'numpy'). Defaults to 'pickle'.
     set_index (str, optional): The column to set as index. Defaults to None.
     drop_columns (list, optional): Columns to drop. Defaults to None.
+    columns (list, optional): Columns to read, only for 'parquet' (a file or a directory of part files). Defaults to None.
     log_info (bool): Whether to log the process. Defaults to True.
 
     Returns:
@@ -29,97 +32,286 @@ def load_data(file_path: str, file_type: str = 'pickle', set_index: str = None,
             df = pd.read_pickle(full_path)
         elif file_type == 'csv':
             df = pd.read_csv(full_path)
+        elif file_type == 'parquet':
+            df = pd.read_parquet(full_path, engine='pyarrow', columns=columns)
         elif file_type == 'numpy':
             data = np.load(full_path)
             if log_info:
-                logging.info(f"Numpy data loaded successfully from {file_path}")
+                logging.info("Numpy data loaded successfully from %s", file_path)
             return data
         else:
             raise ValueError("Unsupported file type specified.")
         
-        # Common DataFrame operations for 'pickle' and 'csv'
+        # Common DataFrame operations for 'pickle', 'csv' and 'parquet'
         if drop_columns:
             df.drop(columns=drop_columns, axis=1, inplace=True)
         if set_index:
             df.set_index(set_index, inplace=True)
         if log_info:
-            logging.info(f"Data loaded successfully from {file_path} as {file_type}")
+            logging.info("Data loaded successfully from %s as %s", file_path, file_type)
         return df
 
     except FileNotFoundError:
         if log_info:
-            logging.error(f"File not found: {full_path}")
+            logging.error("File not found: %s", full_path)
         raise
     except Exception as e:
         if log_info:
-            logging.error(f"Error loading file: {e}")
+            logging.error("Error loading file: %s", e)
         raise
 
 
 def save_data(data, file_path: str, file_type: str = 'pickle', 
               drop_columns: list = None, reset_index: bool = False, 
               log_info: bool = True, create_missing_dirs: bool = True, 
-              append_if_exists: bool = True):
+              append_if_exists: bool = True, incremental_key: str = None):
     """
-    Save a pickle dataframe, CSV, or numpy data to a file. Index can be reset, and
+    Save a pickle dataframe, CSV, Parquet, or numpy data to a file. Index can be reset, and
     columns can be optionally dropped before saving.
 
     Parameters:
     data: The data to save (type depends on file_type).
     file_path (str): The path to the file.
-    file_type (str): The type of file to save ('pickle', 'csv', or 'numpy'). Defaults to 'pickle'.
+    file_type (str): The type of file to save ('pickle', 'csv', 'parquet', or 'numpy'). Defaults to 'pickle'.
     drop_columns (list, optional): Columns to drop if saving a DataFrame. Defaults to None.
     reset_index (bool, optional): Whether to reset the index if saving a DataFrame. Defaults to False.
     log_info (bool): Whether to log the process. Defaults to True.
     create_missing_dirs (bool): Whether to create missing directories in the path. Defaults to True.
     append_if_exists (bool): Whether to append to the file if it exists (only for CSV). Defaults to True.
+    incremental_key (str, optional): Column of sorted keys, if given and the CSV file exists only its rows from
+        the last saved key onwards are rewritten with the rows of data from that key, or the whole file if that
+        isn't possible (only for CSV, append_if_exists is then ignored). Defaults to None.
     """
     try:
         full_path = create_path(file_path, create_missing_dirs=create_missing_dirs, log_info=log_info)
 
-        if file_type == 'pickle':
-            if drop_columns:
-                data.drop(columns=drop_columns, inplace=True)
-            if reset_index:
-                data.reset_index(inplace=True)
-            data.to_pickle(full_path)
-            if log_info:
-                logging.info(f"Pickle DataFrame saved successfully to {file_path}")
-        
-        elif file_type == 'csv':
+        # Drop columns and reset the index of DataFrames on a new frame, the transformations are skipped unless
+        # requested and the caller's data is left unchanged
+        if file_type in ('pickle', 'csv', 'parquet'):
             if drop_columns:
-                data.drop(columns=drop_columns, inplace=True)
+                data = data.drop(columns=drop_columns)
             if reset_index:
-                data.reset_index(inplace=True)
-            
-            # Check if the file exists and whether to append or overwrite
-            if os.path.exists(full_path) and append_if_exists:
-                data.to_csv(full_path, mode='a', header=False, index=False)
-                if log_info:
-                    logging.info(f"Data appended to CSV file: {file_path}")
-            else:
-                data.to_csv(full_path, index=False)
-                if log_info:
-                    logging.info(f"CSV file saved successfully to {file_path}")
-        
-        elif file_type == 'numpy':
-            np.save(full_path, data)
-            if log_info:
-                logging.info(f"Numpy array saved successfully to {file_path}")
-        
-        else:
-            raise ValueError("Unsupported file type specified.")
+                data = data.reset_index()
+
+        # The directory may have been removed since it was created and cached, if so create it again and retry once.
+        # pandas reports a missing directory as a plain OSError, so the directory itself is checked
+        try:
+            _write_data(data, full_path, file_path, file_type, append_if_exists, incremental_key, log_info)
+        except OSError:
+            if not create_missing_dirs or os.path.isdir(os.path.dirname(full_path)):
+                raise
+            _ensure_dir.cache_clear()
+            create_path(file_path, create_missing_dirs=True, log_info=log_info)
+            _write_data(data, full_path, file_path, file_type, append_if_exists, incremental_key, log_info)
     
     except KeyError as e:
         if log_info:
-            logging.error(f"Error dropping columns: {e}")
+            logging.error("Error dropping columns: %s", e)
         raise
     except Exception as e:
         if log_info:
-            logging.error(f"Error saving file: {e}")
+            logging.error("Error saving file: %s", e)
         raise
 
 
+def _write_data(data, full_path: str, file_path: str, file_type: str, append_if_exists: bool,
+                incremental_key: str, log_info: bool):
+    """
+    Write the data to its file in the given format for save_data.
+
+    Parameters:
+    data: The data to save (type depends on file_type).
+    full_path (str): The full path to the file.
+    file_path (str): The path to the file as given to save_data, used in the log messages.
+    file_type (str): The type of file to save ('pickle', 'csv', 'parquet', or 'numpy').
+    append_if_exists (bool): Whether to append to the file if it exists (only for CSV).
+    incremental_key (str): Column of sorted keys to update an existing CSV file by, or None.
+    log_info (bool): Whether to log the process.
+    """
+    if file_type == 'pickle':
+        data.to_pickle(full_path)
+        if log_info:
+            logging.info("Pickle DataFrame saved successfully to %s", file_path)
+    
+    elif file_type == 'csv':
+        # Check if the file exists and whether to update, append or overwrite. A file that can't be updated by its
+        # incremental key is overwritten rather than appended to, as appending would duplicate its rows
+        if os.path.exists(full_path) and incremental_key and _update_csv(data, full_path, incremental_key):
+            if log_info:
+                logging.info("New rows written to CSV file: %s", file_path)
+        elif os.path.exists(full_path) and append_if_exists and not incremental_key:
+            _write_csv(data, full_path, append=True)
+            if log_info:
+                logging.info("Data appended to CSV file: %s", file_path)
+        else:
+            _write_csv(data, full_path, append=False)
+            if log_info:
+                logging.info("CSV file saved successfully to %s", file_path)
+    
+    elif file_type == 'parquet':
+        data.to_parquet(full_path, engine='pyarrow', compression='zstd')
+        if log_info:
+            logging.info("Parquet DataFrame saved successfully to %s", file_path)
+
+    elif file_type == 'numpy':
+        np.save(full_path, data)
+        if log_info:
+            logging.info("Numpy array saved successfully to %s", file_path)
+    
+    else:
+        raise ValueError("Unsupported file type specified.")
+
+
+def _write_csv(df: pd.DataFrame, full_path: str, append: bool):
+    """
+    Write a DataFrame to CSV without the index. The header is only written when the file is created. Frames of
+    only integer, float and whole second timestamp columns are written with pyarrow's multi-threaded writer
+    instead of pandas' to_csv, with floats formatted like pandas (e.g. integral floats as '1.0') so they read
+    back as floats.
+    The text is the same as pandas would write. Other frames (e.g. with strings, booleans, timezones, sub-second
+    timestamps or a single column, which pyarrow would quote or format differently) are written with pandas.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to write.
+    full_path (str): The full path to the file.
+    append (bool): Whether to append the rows to an existing file instead of overwriting it.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pa_compute
+    import pyarrow.csv as pa_csv
+
+    # A single column's missing values would be written as empty lines, pandas quotes them so they aren't skipped
+    for i, dtype in enumerate(df.dtypes if df.shape[1] > 1 else [None]):
+        if not isinstance(dtype, np.dtype) or not (dtype.kind in 'iu' or dtype == np.float64 or dtype.kind == 'M'):
+            break
+        if dtype.kind == 'M':
+            times = df.iloc[:, i].to_numpy()
+            if not ((times.astype('datetime64[s]') == times) | np.isnat(times)).all():
+                break
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for i, field in enumerate(table.schema):
+            # Timestamps are written at second resolution, or as dates if they are all at midnight, which matches
+            # the format of pandas' to_csv rather than printing all of the fractional digits
+            if pa.types.is_timestamp(field.type):
+                times = df.iloc[:, i].to_numpy()
+                dates_only = ((times.astype('datetime64[D]') == times) | np.isnat(times)).all()
+                table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp('s')).cast(
+                    pa.date32() if dates_only else pa.timestamp('s')))
+            # Floats are formatted as strings, adding the '.0' pyarrow leaves off integral values. pyarrow also
+            # switches to exponent notation at other magnitudes than pandas, these (rare) values are formatted
+            # with NumPy, which prints floats the same way as pandas
+            elif pa.types.is_floating(field.type):
+                text = pa_compute.cast(table.column(i).combine_chunks(), pa.string())
+                integral = pa_compute.match_substring_regex(text, r'^-?[0-9]+$')
+                text = pa_compute.if_else(integral, pa_compute.binary_join_element_wise(text, '.0', ''), text)
+                values = df.iloc[:, i].to_numpy()
+                magnitudes = np.abs(values)
+                reformat = np.isfinite(values) & ((magnitudes >= 1e10) | ((magnitudes < 1e-4) & (magnitudes > 0)))
+                if reformat.any():
+                    replacements = pa.array(values[reformat].astype(str))
+                    if isinstance(replacements, pa.ChunkedArray):
+                        replacements = replacements.combine_chunks()
+                    text = pa_compute.replace_with_mask(text, pa.array(reformat), replacements)
+                table = table.set_column(i, field.name, text)
+
+        # None of the values need quoting, and the header is written unquoted as pandas would
+        with open(full_path, 'ab' if append else 'wb') as f:
+            if not append:
+                f.write((','.join(map(str, df.columns)) + '\n').encode())
+            pa_csv.write_csv(table, f, write_options=pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+        return
+
+    df.to_csv(full_path, mode='a' if append else 'w', header=not append, index=False)
+
+
+def _update_csv(df: pd.DataFrame, full_path: str, key: str) -> bool:
+    """
+    Update an existing CSV file with the rows of a DataFrame from the file's last key onwards, instead of
+    rewriting the whole file. The last row is rewritten as well, as it may have been saved incomplete
+    (e.g. a resampled period that was still in progress). Only the header and the last row of the file
+    are read.
+
+    Parameters:
+    df (pd.DataFrame): The full data the file should hold, sorted by key.
+    full_path (str): The full path to the file.
+    key (str): The column of sorted keys identifying the rows.
+
+    Returns:
+    bool: Whether the file was updated, False if it has no rows, different columns, a last key past
+        the data or new timestamps formatted differently than the file's, in which case the file has to
+        be rewritten.
+    """
+    with open(full_path, 'rb+') as f:
+        header = f.readline().decode().rstrip('\r\n')
+
+        # Read back from the end of the file to the start of its last row
+        size = f.seek(0, os.SEEK_END)
+        tail_size = min(size, 1 << 16)
+        f.seek(size - tail_size)
+        tail = f.read(tail_size).rstrip(b'\r\n')
+        last_row_offset = size - tail_size + tail.rfind(b'\n') + 1
+        if header.split(',') != list(map(str, df.columns)) or last_row_offset <= len(header):
+            return False
+
+        last_row = next(csv.reader([tail[tail.rfind(b'\n') + 1:].decode()]))
+        last_key = pd.Series([last_row[df.columns.get_loc(key)]]).astype(df[key].dtype).iloc[0]
+        new_rows = df[df[key] >= last_key]
+        if new_rows.empty:
+            return False
+
+        # pandas formats each timestamp column by the finest unit its values need (e.g. as dates if they are all at
+        # midnight), so the rows kept in the file must need the same units as the new rows or the file would mix
+        # formats that a full rewrite wouldn't
+        kept_rows = df[df[key] < last_key]
+        for column in df.columns:
+            if (pd.api.types.is_datetime64_any_dtype(df[column])
+                    and _timestamp_unit(kept_rows[column]) != _timestamp_unit(new_rows[column])):
+                return False
+
+        f.truncate(last_row_offset)
+
+    _write_csv(new_rows, full_path, append=True)
+    return True
+
+
+def _timestamp_unit(times: pd.Series) -> str:
+    """
+    Find the coarsest unit the (wall clock) timestamps are whole multiples of, which decides how pandas formats
+    a timestamp column in CSV.
+
+    Parameters:
+    times (pd.Series): The timestamps.
+
+    Returns:
+    str: The unit, 'D', 's', 'ms', 'us' or 'ns'.
+    """
+    if times.dt.tz is not None:
+        times = times.dt.tz_localize(None)
+    values = times.to_numpy()
+    for unit in ('D', 's', 'ms', 'us'):
+        if ((values.astype(f'datetime64[{unit}]') == values) | np.isnat(values)).all():
+            return unit
+    return 'ns'
+
+
+@lru_cache(maxsize=4096)
+def _ensure_dir(directory: str, log_info: bool) -> None:
+    """
+    Create the directory and any missing parents. Results are cached so each directory is only checked
+    once per process however many files are saved into it, save_data clears the cache if a cached
+    directory has since been removed.
+
+    Parameters:
+    directory (str): The normalised directory path.
+    log_info (bool): Whether to log when directories are created.
+    """
+    created = log_info and not os.path.isdir(directory)
+    os.makedirs(directory, exist_ok=True)
+    if created:
+        logging.info("Created missing directories: %s", directory)
+
+
 def create_path(input_string: str, create_missing_dirs: bool = False, log_info: bool = True) -> str:
     """
     Create the full path for the given input string. If create_missing_dirs is True,
@@ -144,17 +336,12 @@ def create_path(input_string: str, create_missing_dirs: bool = False, log_info:
     
     # Check and create missing directories if required
     if create_missing_dirs:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            if log_info:
-                logging.info(f"Created missing directories: {directory}")
-    else:
+        _ensure_dir(os.path.normpath(directory), log_info)
+    elif log_info:
         # If not creating dirs, just log missing directories
         if not os.path.exists(directory):
-            if log_info:
-                logging.error(f"Directory not found: {directory}")
+            logging.error("Directory not found: %s", directory)
         elif not os.path.isfile(new_path):
-            if log_info:
-                logging.error(f"File not found: {os.path.basename(new_path)}")
+            logging.error("File not found: %s", os.path.basename(new_path))
     
     return new_path